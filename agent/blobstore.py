@@ -0,0 +1,114 @@
+"""Content-addressed blob store for large tool outputs."""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+REF_PREFIX = "sha256:"
+
+
+def is_blob_ref(value: Any) -> bool:
+    """Check whether a value looks like a blob reference."""
+    return isinstance(value, str) and value.startswith(REF_PREFIX) and len(value) == 71
+
+
+class BlobStore:
+    """
+    Content-addressed store for tool outputs and page content.
+
+    Blobs are keyed by the SHA-256 of their uncompressed bytes and stored
+    gzip-compressed at ``root/<2 hex>/<64 hex>.gz``. Writing content that
+    is already stored is a no-op, so identical pages and results are kept
+    once no matter how many steps or runs produce them. References have
+    the form ``sha256:<hex>``.
+    """
+
+    def __init__(self, root: Path, compress_level: int = 6):
+        """Initialize the blob store."""
+        self.root = root
+        self.compress_level = compress_level
+
+    @staticmethod
+    def ref_for(data: bytes) -> str:
+        """Get the reference for some content."""
+        return REF_PREFIX + hashlib.sha256(data).hexdigest()
+
+    def path_for(self, ref: str) -> Path:
+        """Get the file path for a reference."""
+        if not is_blob_ref(ref):
+            raise ValueError(f"Invalid blob reference: {ref}")
+        digest = ref[len(REF_PREFIX):]
+        return self.root / digest[:2] / f"{digest}.gz"
+
+    def exists(self, ref: str) -> bool:
+        """Check whether a blob is stored."""
+        return self.path_for(ref).exists()
+
+    def put_bytes(self, data: bytes) -> str:
+        """Store content and return its reference."""
+        ref = self.ref_for(data)
+        path = self.path_for(ref)
+        if path.exists():
+            return ref
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wb", compresslevel=self.compress_level) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return ref
+
+    def get_bytes(self, ref: str) -> bytes:
+        """
+        Load content by reference.
+
+        Raises:
+            FileNotFoundError: If the blob is not stored
+        """
+        with gzip.open(self.path_for(ref), "rb") as f:
+            return f.read()
+
+    async def put(self, data: bytes | str) -> str:
+        """Store text or bytes and return the reference."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return await asyncio.to_thread(self.put_bytes, data)
+
+    async def put_json(self, value: Any) -> tuple[str, int]:
+        """Store a JSON-serializable value and return its reference and size."""
+        data = json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        return await self.put(data), len(data)
+
+    async def get(self, ref: str) -> bytes:
+        """Load content by reference."""
+        return await asyncio.to_thread(self.get_bytes, ref)
+
+    async def get_text(self, ref: str) -> str:
+        """Load text content by reference."""
+        return (await self.get(ref)).decode("utf-8")
+
+    async def get_json(self, ref: str) -> Any:
+        """Load a JSON value by reference."""
+        return json.loads(await self.get(ref))
+
+
+# Global blob store instance
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get the shared blob store under the artifacts directory."""
+    global _blob_store
+    if _blob_store is None:
+        settings = get_settings()
+        _blob_store = BlobStore(root=settings.data_dir / "artifacts" / "blobs")
+    return _blob_store
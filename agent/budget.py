@@ -0,0 +1,142 @@
+"""Wall-clock, token and cost budgets for a run."""
+
+import time
+from typing import Any, Optional
+
+# USD per million (prompt, completion) tokens. Keys are matched as prefixes
+# of the model name, longest first, so dated snapshots share their base price.
+MODEL_PRICING: dict[str, tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "o4-mini": (1.10, 4.40),
+    "o3-mini": (1.10, 4.40),
+    "o3": (2.00, 8.00),
+    "o1-mini": (1.10, 4.40),
+    "o1": (15.00, 60.00),
+}
+
+# Unknown models are priced like a large model, so cost budgets err early
+FALLBACK_PRICING = MODEL_PRICING["gpt-4o"]
+
+
+def model_pricing(model: Optional[str]) -> tuple[float, float]:
+    """Get the (prompt, completion) USD price per million tokens of a model."""
+    name = (model or "").lower().split("/")[-1]
+    for prefix in sorted(MODEL_PRICING, key=len, reverse=True):
+        if name.startswith(prefix):
+            return MODEL_PRICING[prefix]
+    return FALLBACK_PRICING
+
+
+def estimate_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimate the USD cost of a model's token usage."""
+    prompt_price, completion_price = model_pricing(model)
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class RunBudget:
+    """
+    Limits on how long a run may take and how much it may spend.
+
+    Any of ``deadline_seconds``, ``max_tokens`` and ``max_cost_usd`` may be
+    None for no limit. Time is measured from ``start``; tokens and cost
+    come from the run's cumulative token usage passed to ``update``. Once
+    any budget is ``wrap_up_fraction`` used, the agent stops researching and
+    writes its report.
+    """
+
+    def __init__(
+        self,
+        model: Optional[str],
+        deadline_seconds: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        max_cost_usd: Optional[float] = None,
+        wrap_up_fraction: float = 0.85,
+    ):
+        """Initialize the budget."""
+        self.model = model
+        self.deadline_seconds = deadline_seconds
+        self.max_tokens = max_tokens
+        self.max_cost_usd = max_cost_usd
+        self.wrap_up_fraction = wrap_up_fraction
+        self.started: Optional[float] = None
+        self.tokens_used = 0
+        self.cost_usd = 0.0
+
+    def start(self, elapsed_seconds: float = 0.0) -> None:
+        """Start the clock unless it is running, counting time already spent."""
+        if self.started is None:
+            self.started = time.monotonic() - elapsed_seconds
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether any limit is set."""
+        return any(
+            limit is not None
+            for limit in (self.deadline_seconds, self.max_tokens, self.max_cost_usd)
+        )
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Wall-clock time since the budget started."""
+        if self.started is None:
+            return 0.0
+        return time.monotonic() - self.started
+
+    def update(self, token_usage: dict[str, int]) -> None:
+        """Record the run's cumulative token usage."""
+        self.tokens_used = token_usage.get("total_tokens", 0)
+        self.cost_usd = estimate_cost(
+            self.model,
+            token_usage.get("prompt_tokens", 0),
+            token_usage.get("completion_tokens", 0),
+        )
+
+    def fractions(self) -> dict[str, float]:
+        """Get the fraction used of each budget that has a limit."""
+        fractions = {}
+        if self.deadline_seconds is not None:
+            fractions["deadline"] = self.elapsed_seconds / self.deadline_seconds
+        if self.max_tokens is not None:
+            fractions["tokens"] = self.tokens_used / self.max_tokens
+        if self.max_cost_usd is not None:
+            fractions["cost"] = self.cost_usd / self.max_cost_usd
+        return fractions
+
+    def most_used(self) -> Optional[tuple[str, float]]:
+        """Get the budget closest to its limit and the fraction used."""
+        fractions = self.fractions()
+        if not fractions:
+            return None
+        return max(fractions.items(), key=lambda item: item[1])
+
+    @property
+    def nearly_exhausted(self) -> bool:
+        """Whether it is time to stop researching and write the report."""
+        most_used = self.most_used()
+        return most_used is not None and most_used[1] >= self.wrap_up_fraction
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether any budget is used up."""
+        most_used = self.most_used()
+        return most_used is not None and most_used[1] >= 1.0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get budget consumption as a plain dict."""
+        most_used = self.most_used()
+        return {
+            "elapsed_seconds": round(self.elapsed_seconds, 1),
+            "deadline_seconds": self.deadline_seconds,
+            "tokens_used": self.tokens_used,
+            "max_tokens": self.max_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "max_cost_usd": self.max_cost_usd,
+            "limiting": most_used[0] if most_used else None,
+            "fraction_used": round(most_used[1], 3) if most_used else 0.0,
+        }
@@ -0,0 +1,261 @@
+"""Record/replay cassettes for tool and model calls."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from agent.model_provider import ChatMessage, ModelProvider, ModelResponse
+from agent.tools import ToolResult, ToolRunner
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+# Tools with only local side effects; these run for real during replay so the
+# run's working files and todo state are rebuilt exactly as when recorded
+LOCAL_TOOLS = {"todo", "file_write", "file_read", "file_edit", "reflect", "context_read"}
+
+
+class CassetteMissError(Exception):
+    """Raised when a replayed run makes a call the cassette has no answer for."""
+
+
+def tool_call_key(tool_name: str, args: dict[str, Any]) -> str:
+    """Get the key that matches a tool call to its recording."""
+    payload = json.dumps([tool_name, args], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def response_to_dict(response: ModelResponse) -> dict[str, Any]:
+    """Serialize a model response for a cassette."""
+    return {
+        "message": asdict(response.message),
+        "finish_reason": response.finish_reason,
+        "usage": response.usage,
+    }
+
+
+def response_from_dict(data: dict[str, Any]) -> ModelResponse:
+    """Rebuild a model response from a cassette entry."""
+    return ModelResponse(
+        message=ChatMessage(**data["message"]),
+        finish_reason=data["finish_reason"],
+        usage=data.get("usage", {}),
+    )
+
+
+class Cassette:
+    """
+    A recording of every model and tool call made by one run.
+
+    Cassettes are JSON Lines files: a header line followed by one line per
+    interaction, appended as the run progresses so a crashed recording keeps
+    everything up to the crash. On replay, model calls are served in the
+    order they were recorded and tool calls are matched by tool name and
+    arguments, in recorded order for repeated identical calls, so replays
+    stay deterministic even if independent tool calls complete in a
+    different order.
+
+    ``latency_scale`` replays each call after its recorded duration
+    multiplied by the scale; 0 serves everything instantly.
+    """
+
+    def __init__(self, path: Path, mode: str, latency_scale: float = 0.0):
+        """Initialize the cassette."""
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+
+        self._model_calls: deque[dict[str, Any]] = deque()
+        self._tool_calls: dict[str, deque[dict[str, Any]]] = defaultdict(deque)
+
+        if mode == "replay":
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._write({
+                "type": "header",
+                "version": CASSETTE_VERSION,
+                "created_at": datetime.utcnow().isoformat(),
+            }, truncate=True)
+
+    def _load(self) -> None:
+        """Load recorded interactions for replay."""
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["type"] == "model":
+                    self._model_calls.append(entry)
+                elif entry["type"] == "tool":
+                    self._tool_calls[entry["key"]].append(entry)
+        logger.info(
+            f"Loaded cassette {self.path.name}: {len(self._model_calls)} model calls, "
+            f"{sum(len(q) for q in self._tool_calls.values())} tool calls"
+        )
+
+    def _write(self, entry: dict[str, Any], truncate: bool = False) -> None:
+        """Append an entry to the cassette file."""
+        with open(self.path, "w" if truncate else "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+
+    async def _delay(self, entry: dict[str, Any]) -> None:
+        """Simulate the recorded latency of an interaction."""
+        if self.latency_scale > 0:
+            await asyncio.sleep(entry.get("duration_ms", 0) / 1000 * self.latency_scale)
+
+    async def model_call(
+        self,
+        call: Callable[[], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        """Record or replay one chat completion."""
+        if self.mode == "replay":
+            if not self._model_calls:
+                raise CassetteMissError(f"Cassette {self.path.name} has no more model calls")
+            entry = self._model_calls.popleft()
+            await self._delay(entry)
+            return response_from_dict(entry["response"])
+
+        start = time.perf_counter()
+        response = await call()
+        self.record_model(response, int((time.perf_counter() - start) * 1000))
+        return response
+    
+    def record_model(self, response: ModelResponse, duration_ms: int) -> None:
+        """Record a chat completion made outside ``model_call``."""
+        self._write({
+            "type": "model",
+            "response": response_to_dict(response),
+            "duration_ms": duration_ms,
+        })
+
+    async def tool_call(
+        self,
+        tool_name: str,
+        args: dict[str, Any],
+        call: Callable[[], Awaitable[ToolResult]],
+    ) -> ToolResult:
+        """Record or replay one tool execution."""
+        key = tool_call_key(tool_name, args)
+
+        if self.mode == "replay":
+            queue = self._tool_calls.get(key)
+            if tool_name in LOCAL_TOOLS:
+                # Keep the queue aligned with the recording, but run for real
+                if queue:
+                    queue.popleft()
+                return await call()
+            if not queue:
+                return ToolResult(
+                    success=False,
+                    output=None,
+                    error=f"No recorded result for {tool_name} in cassette {self.path.name}",
+                )
+            entry = queue.popleft()
+            await self._delay(entry)
+            return ToolResult(**entry["result"])
+
+        start = time.perf_counter()
+        result = await call()
+        self._write({
+            "type": "tool",
+            "key": key,
+            "tool": tool_name,
+            "args": args,
+            "result": asdict(result),
+            "duration_ms": int((time.perf_counter() - start) * 1000),
+        })
+        return result
+
+
+class CassetteProvider(ModelProvider):
+    """Model provider that records to or replays from a cassette.
+
+    In replay mode ``provider`` may be None; no API calls are made.
+    """
+
+    def __init__(self, provider: Optional[ModelProvider], cassette: Cassette):
+        """Initialize the cassette provider."""
+        self.provider = provider
+        self.cassette = cassette
+
+    def _live_provider(self) -> ModelProvider:
+        """Get the wrapped provider, which only a recording has."""
+        if self.provider is None:
+            raise CassetteMissError(f"Cassette {self.cassette.path.name} has no provider to record from")
+        return self.provider
+
+    async def chat_completion(
+        self,
+        messages: list[ChatMessage],
+        tools: Optional[list[dict]] = None,
+        **kwargs
+    ) -> ModelResponse:
+        """Perform a recorded or replayed chat completion."""
+        return await self.cassette.model_call(
+            lambda: self._live_provider().chat_completion(messages, tools, **kwargs)
+        )
+
+    async def chat_completion_stream(
+        self,
+        messages: list[ChatMessage],
+        tools: Optional[list[dict]] = None,
+        **kwargs
+    ) -> AsyncGenerator[ModelResponse, None]:
+        """Perform a streaming chat completion.
+
+        Chunks are passed through as they arrive while recording, but only
+        the final accumulated response is recorded, so a replayed stream
+        yields it as a single chunk.
+        """
+        if self.cassette.mode == "replay":
+            yield await self.chat_completion(messages, tools, **kwargs)
+            return
+
+        start = time.perf_counter()
+        final = None
+        async for response in self._live_provider().chat_completion_stream(messages, tools, **kwargs):
+            final = response
+            yield response
+        if final is not None:
+            self.cassette.record_model(final, int((time.perf_counter() - start) * 1000))
+
+
+class CassetteToolSet:
+    """Toolset wrapper that records or replays every ``execute`` call."""
+
+    def __init__(self, toolset: ToolRunner, cassette: Cassette):
+        """Initialize the wrapper."""
+        self.toolset = toolset
+        self.cassette = cassette
+
+    def get_all_schemas(self) -> list[dict]:
+        """Get the wrapped toolset's schemas."""
+        return self.toolset.get_all_schemas()
+
+    async def execute(self, tool_name: str, **kwargs) -> ToolResult:
+        """Execute a tool through the cassette."""
+        return await self.cassette.tool_call(
+            tool_name,
+            kwargs,
+            lambda: self.toolset.execute(tool_name, **kwargs),
+        )
+
+
+def cassette_path(name: str) -> Path:
+    """Get the path of a named cassette under the data directory."""
+    if not name or Path(name).name != name:
+        raise ValueError(f"Invalid cassette name: {name!r}")
+    return get_settings().data_dir / "cassettes" / f"{name}.jsonl"
@@ -0,0 +1,271 @@
+"""Per-step checkpoints of agent state for crash recovery."""
+
+import json
+import logging
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+import aiofiles
+
+from agent.blobstore import BlobStore
+from agent.context import SpillEvent, spill_key
+from agent.model_provider import ChatMessage
+from agent.react_agent import AgentState
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = "checkpoint.jsonl"
+CHECKPOINT_VERSION = 1
+
+
+def read_checkpoint(path: Path, until_step: Optional[int] = None) -> list[dict[str, Any]]:
+    """
+    Read the step entries of a checkpoint log.
+
+    A torn last line, left by a crash in the middle of a write, is skipped.
+
+    Args:
+        path: Checkpoint file
+        until_step: Only read entries up to and including this step
+
+    Returns:
+        Step entries in order (empty if there is no checkpoint)
+    """
+    if not path.exists():
+        return []
+
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping torn checkpoint entry in {path}")
+                continue
+            if until_step is not None and entry["step"] > until_step:
+                break
+            entries.append(entry)
+    return entries
+
+
+def fork_checkpoint(
+    source: Path,
+    target: Path,
+    until_step: int,
+    event_ids: Optional[dict[str, str]] = None,
+) -> Optional[dict[str, Any]]:
+    """
+    Start a new checkpoint log from the first steps of another run's log.
+
+    The copied prefix is left unfinished so the new run continues from it:
+    the last entry is marked incomplete, any wrap-up is cleared and the
+    clock starts at zero. Tool events are renamed through ``event_ids``.
+
+    Args:
+        source: Checkpoint file of the parent run
+        target: Checkpoint file of the new run
+        until_step: Last step to copy
+        event_ids: Parent tool event IDs to the IDs of their copies
+
+    Returns:
+        The last copied entry, or None if the parent has no checkpoint of
+        that step
+    """
+    entries = read_checkpoint(source, until_step)
+    if not entries or entries[-1]["step"] != until_step:
+        return None
+
+    event_ids = event_ids or {}
+    for entry in entries:
+        for tool_call in entry["tool_calls"]:
+            if tool_call.get("event_id") in event_ids:
+                tool_call["event_id"] = event_ids[tool_call["event_id"]]
+
+    last = entries[-1]
+    last["is_complete"] = False
+    last["wrap_up_reason"] = None
+    for entry in entries:
+        entry["elapsed_seconds"] = 0.0
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, default=str) + "\n")
+    return last
+
+
+class Checkpointer:
+    """
+    Append-only checkpoint log of one run's AgentState.
+
+    After every step, ``write_step`` appends one JSON line holding only
+    what changed: new messages, messages rewritten in place by history
+    compaction, new tool calls, new evidence and evidence that merged
+    repeat hits, claims, report drafts, spills and digests, the todo list
+    if it changed, and the running totals. A step never rewrites earlier
+    lines, so the cost of a checkpoint does not grow with the run.
+    ``restore`` replays the log into a fresh state.
+
+    Evidence page text is moved into the blob store as it is checkpointed,
+    leaving a ``content_ref`` on the evidence item.
+    """
+
+    def __init__(self, path: Path, blob_store: Optional[BlobStore] = None):
+        """Initialize the checkpointer."""
+        self.path = path
+        self.blob_store = blob_store
+        # Content of every checkpointed message, to spot in-place rewrites
+        self._contents: list[Optional[str]] = []
+        self._tool_calls = 0
+        self._evidence = 0
+        # Hit count of every checkpointed evidence item, to spot merges
+        self._evidence_hits: list[int] = []
+        self._claims = 0
+        self._report_drafts = 0
+        self._context_spills = 0
+        self._first_actions = 0
+        self._digests: set[str] = set()
+        self._todo: Optional[list[dict]] = None
+
+    async def write_step(
+        self,
+        state: AgentState,
+        todo_items: Optional[list[dict]] = None,
+        elapsed_seconds: float = 0.0,
+    ) -> None:
+        """Append the changes made to the state since the last checkpoint."""
+        written = len(self._contents)
+        rewrites = {
+            str(i): state.messages[i].content
+            for i in range(written)
+            if state.messages[i].content is not self._contents[i]
+        }
+        for i in map(int, rewrites):
+            self._contents[i] = state.messages[i].content
+        new_messages = state.messages[written:]
+        self._contents.extend(m.content for m in new_messages)
+
+        evidence = state.evidence[self._evidence:]
+        evidence_updates = {
+            str(i): state.evidence[i]
+            for i in range(self._evidence)
+            if state.evidence[i].get("hit_count", 1) != self._evidence_hits[i]
+        }
+        if self.blob_store is not None:
+            for item in [*evidence, *evidence_updates.values()]:
+                content = item.pop("content", None)
+                if content:
+                    item["content_ref"] = await self.blob_store.put(content)
+
+        digests = {
+            call_id: digest for call_id, digest in state.tool_digests.items()
+            if call_id not in self._digests
+        }
+        self._digests.update(digests)
+
+        todo = None
+        if todo_items is not None and todo_items != self._todo:
+            todo = self._todo = [dict(item) for item in todo_items]
+
+        entry = {
+            "type": "step",
+            "version": CHECKPOINT_VERSION,
+            "step": state.step_count,
+            "written_at": datetime.utcnow().isoformat(),
+            "phase": state.current_phase,
+            "messages": [asdict(m) for m in new_messages],
+            "rewrites": rewrites,
+            "tool_calls": state.tool_calls[self._tool_calls:],
+            "evidence": evidence,
+            "evidence_updates": evidence_updates,
+            "claims": state.claims[self._claims:],
+            "report_drafts": state.report_drafts[self._report_drafts:],
+            "context_spills": [asdict(s) for s in state.context_spills[self._context_spills:]],
+            "first_action_ms": state.first_action_ms[self._first_actions:],
+            "tool_digests": digests,
+            "todo": todo,
+            "token_usage": state.token_usage,
+            "history_tokens_saved": state.history_tokens_saved,
+            "wrap_up_reason": state.wrap_up_reason,
+            "is_complete": state.is_complete,
+            "elapsed_seconds": round(elapsed_seconds, 3),
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(self.path, "a", encoding="utf-8") as f:
+            await f.write(json.dumps(entry, default=str) + "\n")
+
+        self._tool_calls = len(state.tool_calls)
+        self._evidence = len(state.evidence)
+        self._evidence_hits = [item.get("hit_count", 1) for item in state.evidence]
+        self._claims = len(state.claims)
+        self._report_drafts = len(state.report_drafts)
+        self._context_spills = len(state.context_spills)
+        self._first_actions = len(state.first_action_ms)
+
+    def restore(self, state: AgentState, until_step: Optional[int] = None) -> Optional[dict[str, Any]]:
+        """
+        Rebuild a fresh state from the checkpoint log.
+
+        Later checkpoints continue the same log as if the run had never
+        stopped.
+
+        Returns:
+            The last step entry with ``todo`` set to the latest todo list and
+            ``compacted`` to the spill keys of the tool outputs that were
+            rewritten, or None if there is no checkpoint
+        """
+        entries = read_checkpoint(self.path, until_step)
+        if not entries:
+            return None
+
+        # Messages are added with their final content so the ledger counts them once
+        messages: list[dict] = []
+        rewritten: set[str] = set()
+        todo = None
+        for entry in entries:
+            messages.extend(entry["messages"])
+            for i, content in entry["rewrites"].items():
+                messages[int(i)]["content"] = content
+                if messages[int(i)]["role"] == "tool":
+                    rewritten.add(spill_key(ChatMessage(**messages[int(i)]), int(i)))
+            state.tool_calls.extend(entry["tool_calls"])
+            state.evidence.extend(entry["evidence"])
+            for i, item in entry.get("evidence_updates", {}).items():
+                state.evidence[int(i)] = item
+            state.claims.extend(entry["claims"])
+            state.report_drafts.extend(entry["report_drafts"])
+            state.context_spills.extend(SpillEvent(**s) for s in entry["context_spills"])
+            state.first_action_ms.extend(entry["first_action_ms"])
+            state.tool_digests.update(entry["tool_digests"])
+            if entry["todo"] is not None:
+                todo = entry["todo"]
+
+        for data in messages:
+            state.add_message(ChatMessage(**data))
+        state.reindex_evidence()
+
+        last = entries[-1]
+        state.step_count = last["step"]
+        state.current_phase = last["phase"]
+        state.token_usage = dict(last["token_usage"])
+        state.history_tokens_saved = last["history_tokens_saved"]
+        state.wrap_up_reason = last["wrap_up_reason"]
+        state.is_complete = last["is_complete"]
+
+        self._contents = [m.content for m in state.messages]
+        self._tool_calls = len(state.tool_calls)
+        self._evidence = len(state.evidence)
+        self._evidence_hits = [item.get("hit_count", 1) for item in state.evidence]
+        self._claims = len(state.claims)
+        self._report_drafts = len(state.report_drafts)
+        self._context_spills = len(state.context_spills)
+        self._first_actions = len(state.first_action_ms)
+        self._digests = set(state.tool_digests)
+        self._todo = todo
+
+        return {**last, "todo": todo, "compacted": sorted(rewritten)}
@@ -0,0 +1,235 @@
+"""Context management: history compaction and token-budgeted disk spill."""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import aiofiles
+
+from agent.model_provider import ChatMessage
+from agent.tokens import TokenLedger
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_DIR = "context"
+CONTEXT_READ_TOOL = "context_read"
+PREVIEW_CHARS = 300
+
+
+@dataclass
+class SpillEvent:
+    """A tool output moved out of the prompt."""
+    tool_call_id: str
+    tool_name: str
+    file_path: Optional[str]
+    summary: str
+    tokens_saved: int
+
+
+def spill_key(message: ChatMessage, index: int) -> str:
+    """
+    Identify a tool output for spilling.
+
+    This is its tool call ID, or its position in the history when the ID is
+    empty, as it is for tool calls streamed without one, so such outputs
+    never share a spill file.
+    """
+    return message.tool_call_id or f"message-{index}"
+
+
+def last_assistant_index(messages: list[ChatMessage]) -> int:
+    """Get the position of the last assistant message, or the history length if none."""
+    return max(
+        (i for i, m in enumerate(messages) if m.role == "assistant"),
+        default=len(messages),
+    )
+
+
+class ContextManager:
+    """
+    Keeps the prompt of a run small.
+
+    With ``keep_tool_outputs`` set, only the most recent tool outputs stay
+    verbatim; older ones are replaced by a compact digest (see
+    ``compact``) as soon as they age out, regardless of the budget.
+
+    Before each model call, the oldest tool outputs are moved out of the
+    message history until the estimate fits ``max_tokens`` minus
+    ``reserve_tokens`` (room for the completion and tool schemas). Each
+    spilled output is written to ``<workdir>/context/<tool_call_id>.txt``
+    and replaced by a stub with a short preview, which the model can page
+    back in with the ``context_read`` tool. Outputs of ``context_read``
+    itself are dropped to a stub without a new file, since the content is
+    already on disk.
+
+    The system prompt, the user query and tool outputs the model has not
+    seen yet are never spilled. With ``spill_to_disk`` off, no budget is
+    enforced and compacted outputs are not kept on disk.
+    """
+
+    def __init__(
+        self,
+        workdir: str,
+        max_tokens: int,
+        reserve_tokens: int = 8000,
+        keep_tool_outputs: Optional[int] = None,
+        spill_to_disk: bool = True,
+    ):
+        """Initialize the context manager."""
+        self.spill_dir = os.path.join(workdir, CONTEXT_DIR)
+        self.max_tokens = max_tokens
+        self.reserve_tokens = reserve_tokens
+        self.keep_tool_outputs = keep_tool_outputs
+        self.spill_to_disk = spill_to_disk
+        # Tool outputs already replaced by a stub or digest
+        self._spilled: set[str] = set()
+
+    def mark_spilled(self, keys: list[str]) -> None:
+        """Record tool outputs already replaced, by ``spill_key``, e.g. from a checkpoint."""
+        self._spilled.update(keys)
+
+    @property
+    def budget(self) -> int:
+        """Token budget for the message history."""
+        return max(0, self.max_tokens - self.reserve_tokens)
+
+    async def compact(
+        self,
+        messages: list[ChatMessage],
+        digests: dict[str, str],
+        ledger: TokenLedger,
+    ) -> int:
+        """
+        Replace tool outputs older than the last ``keep_tool_outputs`` with digests.
+
+        Only outputs the model has already seen (those before the last
+        assistant turn) count toward the cutoff and can be compacted.
+        Outputs without a digest (including any without a tool call ID,
+        whose digest can't be told apart), or whose digest is not smaller,
+        are left alone. Messages are rewritten in place through the ledger.
+
+        Returns:
+            Prompt tokens saved by this call
+        """
+        if self.keep_tool_outputs is None:
+            return 0
+
+        last_assistant = last_assistant_index(messages)
+        tool_messages = [
+            (i, m) for i, m in enumerate(messages[:last_assistant]) if m.role == "tool"
+        ]
+        cutoff = max(0, len(tool_messages) - self.keep_tool_outputs)
+
+        saved = 0
+        for index, message in tool_messages[:cutoff]:
+            key = spill_key(message, index)
+            digest = digests.get(message.tool_call_id) if message.tool_call_id else None
+            if key in self._spilled or digest is None:
+                continue
+            if len(digest) >= len(message.content or ""):
+                continue
+
+            self._spilled.add(key)
+            if self.spill_to_disk:
+                name = await self._write_spill(key, message.content or "")
+                digest += f'\n[Full output: context_read with name "{name}"]'
+            saved += ledger.replace_content(message, digest)
+
+        return saved
+
+    async def fit(
+        self,
+        messages: list[ChatMessage],
+        ledger: TokenLedger,
+    ) -> list[SpillEvent]:
+        """
+        Spill old tool outputs until the history fits the budget.
+
+        Messages are rewritten in place through the ledger, whose running
+        total is the size of the history.
+
+        Returns:
+            The spills made by this call
+        """
+        if not self.spill_to_disk:
+            return []
+
+        if ledger.total <= self.budget:
+            return []
+
+        # Tool outputs after the last assistant turn have not been seen yet
+        last_assistant = last_assistant_index(messages)
+        tool_names = {
+            tc["id"]: tc["function"]["name"]
+            for m in messages[:last_assistant]
+            for tc in m.tool_calls or []
+        }
+
+        events = []
+        for index, message in enumerate(messages[:last_assistant]):
+            if ledger.total <= self.budget:
+                break
+            key = spill_key(message, index)
+            if message.role != "tool" or key in self._spilled:
+                continue
+
+            tool_name = tool_names.get(message.tool_call_id, "unknown") if message.tool_call_id else "unknown"
+            events.append(await self._spill(message, key, tool_name, ledger))
+
+        if ledger.total > self.budget:
+            logger.warning(
+                f"Context still over budget after spilling: {ledger.total} of {self.budget} tokens"
+            )
+        return events
+
+    async def _write_spill(self, key: str, content: str) -> str:
+        """Write a tool output to the spill directory and return its name."""
+        name = f"{os.path.basename(key)}.txt"
+        os.makedirs(self.spill_dir, exist_ok=True)
+        async with aiofiles.open(os.path.join(self.spill_dir, name), "w", encoding="utf-8") as f:
+            await f.write(content)
+        return name
+
+    async def _spill(
+        self,
+        message: ChatMessage,
+        key: str,
+        tool_name: str,
+        ledger: TokenLedger,
+    ) -> SpillEvent:
+        """Move one tool output to disk and replace it with a stub."""
+        content = message.content or ""
+        self._spilled.add(key)
+
+        if tool_name == CONTEXT_READ_TOOL:
+            saved = ledger.replace_content(
+                message,
+                "[Paged-in context removed to save space; "
+                "call context_read again if you still need it.]",
+            )
+            return SpillEvent(
+                tool_call_id=key,
+                tool_name=tool_name,
+                file_path=None,
+                summary="Dropped paged-in context",
+                tokens_saved=saved,
+            )
+
+        name = await self._write_spill(key, content)
+        path = os.path.join(self.spill_dir, name)
+
+        preview = " ".join(content[:PREVIEW_CHARS].split())
+        saved = ledger.replace_content(
+            message,
+            f"[{tool_name} output ({len(content)} chars) moved out of context. "
+            f"Preview: {preview}... "
+            f'Use context_read with name "{name}" to read it.]',
+        )
+        return SpillEvent(
+            tool_call_id=key,
+            tool_name=tool_name,
+            file_path=path,
+            summary=f"Spilled {tool_name} output ({len(content)} chars) to {CONTEXT_DIR}/{name}",
+            tokens_saved=saved,
+        )
@@ -0,0 +1,243 @@
+"""HTML-to-markdown extraction engines for the browsing tools."""
+
+import asyncio
+import logging
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Elements stripped before extraction (scripts, styles and page chrome)
+BOILERPLATE_TAGS = ["script", "style", "nav", "footer", "header"]
+
+MAX_CONTENT_CHARS = 15000
+MAX_LINKS = 50
+
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "details", "div", "dl",
+    "dt", "fieldset", "figcaption", "figure", "form", "main", "ol", "p",
+    "section", "summary", "table", "tbody", "thead", "tfoot", "tr", "ul",
+}
+_HEADING_LEVELS = {f"h{i}": i for i in range(1, 7)}
+_SKIP_NODES = {"-comment", "-doctype"}
+
+
+def _finalize(title: str, text: str, links: list[dict]) -> dict[str, Any]:
+    """Apply the shared truncation rules to an extraction result."""
+    if len(text) > MAX_CONTENT_CHARS:
+        text = text[:MAX_CONTENT_CHARS] + "\n\n[Content truncated...]"
+    return {
+        "title": title,
+        "content": text,
+        "links": links[:MAX_LINKS],
+    }
+
+
+def extract_with_bs4(html: str) -> dict[str, Any]:
+    """Extract content with BeautifulSoup and markdownify (pure-Python fallback)."""
+    from bs4 import BeautifulSoup
+    from markdownify import markdownify
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    for element in soup(BOILERPLATE_TAGS):
+        element.decompose()
+
+    # Get main content
+    main_content = soup.find("main") or soup.find("article") or soup.body
+
+    if main_content:
+        # Convert to markdown for cleaner output
+        text = markdownify(str(main_content), heading_style="ATX")
+    else:
+        text = soup.get_text(separator="\n", strip=True)
+
+    links = []
+    for a in soup.find_all("a", href=True):
+        href = str(a["href"])
+        if href.startswith("http"):
+            links.append({
+                "text": a.get_text(strip=True),
+                "url": href
+            })
+        if len(links) >= MAX_LINKS:
+            break
+
+    title = str(soup.title.string) if soup.title and soup.title.string else ""
+    return _finalize(title, text, links)
+
+
+def _collapse(text: str) -> str:
+    """Collapse runs of inline whitespace."""
+    return re.sub(r"\s+", " ", text)
+
+
+def _render_markdown(node, out: list[str]) -> None:
+    """Render a selectolax node tree as ATX-style markdown into ``out``."""
+    for child in node.iter(include_text=True):
+        tag = child.tag
+
+        if tag == "-text":
+            out.append(_collapse(child.text(deep=False)))
+        elif tag in _SKIP_NODES:
+            continue
+        elif tag in _HEADING_LEVELS:
+            heading = _collapse(child.text(separator=" ")).strip()
+            if heading:
+                out.append(f"\n\n{'#' * _HEADING_LEVELS[tag]} {heading}\n\n")
+        elif tag == "a":
+            href = child.attributes.get("href") or ""
+            label = _collapse(child.text(separator=" ")).strip()
+            out.append(f"[{label}]({href})" if href and label else label)
+        elif tag in ("strong", "b"):
+            inner = _collapse(child.text(separator=" ")).strip()
+            if inner:
+                out.append(f"**{inner}**")
+        elif tag in ("em", "i"):
+            inner = _collapse(child.text(separator=" ")).strip()
+            if inner:
+                out.append(f"*{inner}*")
+        elif tag == "code":
+            out.append(f"`{child.text(deep=True)}`")
+        elif tag == "pre":
+            out.append(f"\n\n```\n{child.text(deep=True).strip()}\n```\n\n")
+        elif tag == "br":
+            out.append("\n")
+        elif tag == "li":
+            out.append("\n* ")
+            _render_markdown(child, out)
+        elif tag in ("td", "th"):
+            out.append(" | ")
+            _render_markdown(child, out)
+        elif tag == "img":
+            continue
+        elif tag in _BLOCK_TAGS:
+            out.append("\n\n")
+            _render_markdown(child, out)
+            out.append("\n\n")
+        else:
+            _render_markdown(child, out)
+
+
+def extract_with_selectolax(html: str) -> dict[str, Any]:
+    """Extract content with the C-backed lexbor parser from selectolax."""
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+
+    title_node = tree.css_first("title")
+    title = title_node.text(strip=True) if title_node else ""
+
+    tree.strip_tags(BOILERPLATE_TAGS)
+
+    main_content = tree.css_first("main") or tree.css_first("article") or tree.body
+
+    if main_content is not None:
+        parts: list[str] = []
+        _render_markdown(main_content, parts)
+        lines = [line.strip() for line in "".join(parts).split("\n")]
+        text = re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+    else:
+        text = tree.text(separator="\n", strip=True)
+
+    links = []
+    for a in tree.css("a[href]"):
+        href = a.attributes.get("href") or ""
+        if href.startswith("http"):
+            links.append({
+                "text": a.text(strip=True),
+                "url": href
+            })
+        if len(links) >= MAX_LINKS:
+            break
+
+    return _finalize(title, text, links)
+
+
+ENGINES = {
+    "selectolax": extract_with_selectolax,
+    "bs4": extract_with_bs4,
+}
+
+
+def resolve_engine(engine: str = "auto") -> str:
+    """Resolve ``auto`` to the fastest installed engine."""
+    if engine != "auto":
+        return engine
+    try:
+        import selectolax.lexbor  # noqa: F401
+    except ImportError:
+        return "bs4"
+    return "selectolax"
+
+
+def extract_page(html: str, engine: str = "auto") -> dict[str, Any]:
+    """
+    Extract the title, markdown content and outbound links from HTML.
+
+    Args:
+        html: The page source
+        engine: ``selectolax``, ``bs4`` or ``auto``
+
+    Returns:
+        Dict with ``title``, ``content`` and ``links``
+    """
+    name = resolve_engine(engine)
+    try:
+        return ENGINES[name](html)
+    except Exception as e:
+        if name == "bs4":
+            raise
+        logger.warning(f"{name} extraction failed, falling back to bs4: {e}")
+        return extract_with_bs4(html)
+
+
+# Global process pool for extraction
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    """Get the extraction process pool, or None if running in threads."""
+    global _pool
+    from backend.config import get_settings
+
+    workers = get_settings().extraction_workers
+    if workers <= 0:
+        return None
+    if _pool is None:
+        # spawn avoids forking a process that already runs threads
+        _pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+async def extract_page_async(html: str) -> dict[str, Any]:
+    """Extract a page off the event loop, in the process pool when enabled."""
+    global _pool
+    from backend.config import get_settings
+
+    engine = resolve_engine(get_settings().extraction_engine)
+    pool = _get_pool()
+
+    if pool is not None:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(pool, extract_page, html, engine)
+        except BrokenProcessPool:
+            logger.warning("Extraction process pool broke, recreating it")
+            _pool = None
+
+    return await asyncio.to_thread(extract_page, html, engine)
+
+
+def shutdown_extraction_pool() -> None:
+    """Shut down the extraction process pool."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
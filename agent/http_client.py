@@ -0,0 +1,73 @@
+"""Process-wide pooled HTTP client shared by the browsing tools."""
+
+import logging
+from importlib.util import find_spec
+from typing import Optional
+
+import httpx
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (compatible; DeepResearchBot/1.0)"
+
+
+def _http2_available() -> bool:
+    """Check whether the optional HTTP/2 dependency is installed."""
+    return find_spec("h2") is not None
+
+
+def accept_encoding() -> str:
+    """Build an Accept-Encoding header from the decoders httpx can use."""
+    encodings = ["gzip", "deflate"]
+    if find_spec("brotli") is not None or find_spec("brotlicffi") is not None:
+        encodings.append("br")
+    if find_spec("zstandard") is not None:
+        encodings.append("zstd")
+    return ", ".join(encodings)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create a pooled client configured from settings."""
+    settings = get_settings()
+
+    http2 = settings.http2_enabled and _http2_available()
+    if settings.http2_enabled and not http2:
+        logger.warning("h2 not installed, falling back to HTTP/1.1")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=settings.http_timeout_seconds,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+        headers={
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,text/plain;q=0.9,*/*;q=0.5",
+            "Accept-Encoding": accept_encoding(),
+        },
+    )
+
+
+# Global client instance
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it if necessary."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its connection pool."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -6,7 +6,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any, AsyncGenerator, Optional
 
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, BadRequestError
 
 from backend.config import get_settings
 
@@ -15,15 +15,35 @@ logger = logging.getLogger(__name__)
 
 @dataclass
 class ChatMessage:
-    """A message in the chat history."""
+    """
+    A message in the chat history.
+    
+    The API dict is built once and reused by every later request that
+    includes the message; assigning any field rebuilds it. Changes made
+    inside ``tool_calls`` in place are not seen, so replace the list
+    instead.
+    """
     role: str  # system, user, assistant, tool
     content: Optional[str] = None
     tool_calls: Optional[list[dict]] = None
     tool_call_id: Optional[str] = None
     name: Optional[str] = None
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set a field, dropping the cached API dict."""
+        # Kept out of the dataclass fields so asdict() and equality ignore it
+        self.__dict__.pop("_wire", None)
+        object.__setattr__(self, name, value)
+    
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for API calls."""
+        """Convert to dictionary for API calls (cached; do not modify)."""
+        wire = self.__dict__.get("_wire")
+        if wire is None:
+            wire = self.__dict__["_wire"] = self._build_dict()
+        return wire
+    
+    def _build_dict(self) -> dict[str, Any]:
+        """Build the API dictionary."""
         d = {"role": self.role}
         if self.content is not None:
             d["content"] = self.content
@@ -63,7 +83,7 @@ class ModelProvider(ABC):
         pass
     
     @abstractmethod
-    async def chat_completion_stream(
+    def chat_completion_stream(
         self,
         messages: list[ChatMessage],
         tools: Optional[list[dict]] = None,
@@ -90,6 +110,8 @@ class OpenAIProvider(ModelProvider):
         self.base_url = base_url or settings.openai_base_url
         self.model = model
         self.default_kwargs = kwargs
+        # Cleared if the server rejects stream_options, as some compatible ones do
+        self.stream_usage = True
         
         self.client = AsyncOpenAI(
             api_key=self.api_key,
@@ -162,7 +184,14 @@ class OpenAIProvider(ModelProvider):
         tools: Optional[list[dict]] = None,
         **kwargs
     ) -> AsyncGenerator[ModelResponse, None]:
-        """Perform a streaming chat completion."""
+        """
+        Perform a streaming chat completion.
+        
+        Yields the response accumulated so far after every chunk; the last
+        one yielded is the complete response, with usage when the API
+        reports it. Usage is requested with ``stream_options``; a server
+        that rejects it is asked again without it, and never again after.
+        """
         try:
             merged_kwargs = {**self.default_kwargs, **kwargs}
             
@@ -174,21 +203,49 @@ class OpenAIProvider(ModelProvider):
                 "stream": True,
                 **merged_kwargs,
             }
+            if self.stream_usage:
+                # Usage arrives in a final chunk with no choices
+                call_kwargs["stream_options"] = {"include_usage": True}
             
             if tools:
                 call_kwargs["tools"] = tools
                 call_kwargs["tool_choice"] = "auto"
             
-            stream = await self.client.chat.completions.create(**call_kwargs)
+            try:
+                stream = await self.client.chat.completions.create(**call_kwargs)
+            except BadRequestError:
+                if "stream_options" not in call_kwargs:
+                    raise
+                # A second rejection means the request itself was bad
+                del call_kwargs["stream_options"]
+                stream = await self.client.chat.completions.create(**call_kwargs)
+                logger.info(f"{self.base_url} rejects stream_options, streaming without usage")
+                self.stream_usage = False
             
             accumulated_content = ""
             accumulated_tool_calls: dict[int, dict] = {}
+            finish_reason = "null"
             
             async for chunk in stream:
                 if not chunk.choices:
+                    if chunk.usage:
+                        yield ModelResponse(
+                            message=ChatMessage(
+                                role="assistant",
+                                content=accumulated_content if accumulated_content else None,
+                                tool_calls=list(accumulated_tool_calls.values()) if accumulated_tool_calls else None,
+                            ),
+                            finish_reason=finish_reason,
+                            usage={
+                                "prompt_tokens": chunk.usage.prompt_tokens,
+                                "completion_tokens": chunk.usage.completion_tokens,
+                                "total_tokens": chunk.usage.total_tokens,
+                            },
+                        )
                     continue
                 
                 choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
                 delta = choice.delta
                 
                 # Accumulate content
@@ -225,7 +282,7 @@ class OpenAIProvider(ModelProvider):
                         content=accumulated_content if accumulated_content else None,
                         tool_calls=tool_calls_list,
                     ),
-                    finish_reason=choice.finish_reason or "null",
+                    finish_reason=finish_reason,
                 )
             
         except Exception as e:
@@ -0,0 +1,196 @@
+"""Persistent on-disk cache of fetched web pages."""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from agent.urls import normalize_url
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedPage:
+    """A fetched page with its raw body and extracted content."""
+    url: str
+    body: str
+    extracted: dict[str, Any]
+    fetched_at: float = field(default_factory=time.time)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        """Check whether the page can be served without revalidation."""
+        return time.time() - self.fetched_at < ttl_seconds
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Get headers for a conditional revalidation request."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """
+    Content cache for web pages keyed by normalized URL.
+
+    Entries are gzip-compressed JSON files under the cache directory.
+    Recency is tracked in an in-memory LRU index (seeded from file mtimes)
+    and the least recently used entries are evicted once the total size on
+    disk exceeds the configured cap.
+    """
+
+    def __init__(self, root: Path, max_bytes: int, ttl_seconds: float):
+        """Initialize the page cache."""
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+        self._index: Optional[OrderedDict[str, int]] = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """Get the cache key for a URL."""
+        return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def _path_for(self, key: str) -> Path:
+        """Get the file path for a cache key."""
+        return self.root / key[:2] / f"{key}.json.gz"
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        """Build the LRU index from the files on disk (oldest first)."""
+        if self._index is not None:
+            return self._index
+
+        entries = []
+        if self.root.exists():
+            for path in self.root.glob("*/*.json.gz"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                key = path.name[: -len(".json.gz")]
+                entries.append((stat.st_mtime, key, stat.st_size))
+        entries.sort()
+
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._total_bytes = sum(size for _, _, size in entries)
+        return self._index
+
+    def _read(self, key: str) -> Optional[CachedPage]:
+        """Read an entry from disk and mark it as recently used."""
+        path = self._path_for(key)
+        with self._lock:
+            index = self._load_index()
+            if key not in index:
+                return None
+            index.move_to_end(key)
+
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable page cache entry {key}: {e}")
+            self._remove(key)
+            return None
+
+        return CachedPage(**data)
+
+    def _write(self, key: str, page: CachedPage) -> None:
+        """Write an entry to disk and evict old entries if over the cap."""
+        path = self._path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_suffix(".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(asdict(page), f)
+        os.replace(tmp_path, path)
+        size = path.stat().st_size
+
+        with self._lock:
+            index = self._load_index()
+            self._total_bytes += size - index.get(key, 0)
+            index[key] = size
+            index.move_to_end(key)
+
+            evicted = []
+            while self._total_bytes > self.max_bytes and len(index) > 1:
+                old_key, old_size = index.popitem(last=False)
+                self._total_bytes -= old_size
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            try:
+                self._path_for(old_key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry from the index and disk."""
+        with self._lock:
+            index = self._load_index()
+            size = index.pop(key, None)
+            if size is not None:
+                self._total_bytes -= size
+        try:
+            self._path_for(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    async def get(self, url: str) -> Optional[CachedPage]:
+        """Look up a cached page, fresh or stale."""
+        return await asyncio.to_thread(self._read, self.key_for(url))
+
+    async def put(self, page: CachedPage) -> None:
+        """Store a page in the cache."""
+        try:
+            await asyncio.to_thread(self._write, self.key_for(page.url), page)
+        except OSError as e:
+            logger.warning(f"Failed to write page cache entry for {page.url}: {e}")
+
+    def stats(self) -> dict[str, int]:
+        """Get cache counters."""
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_revalidations": self.revalidations,
+        }
+
+
+# Global page cache instance
+_page_cache: Optional[PageCache] = None
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """Get the shared page cache, or None if caching is disabled."""
+    global _page_cache
+    settings = get_settings()
+    if not settings.page_cache_enabled:
+        return None
+    if _page_cache is None:
+        _page_cache = PageCache(
+            root=settings.data_dir / "cache" / "pages",
+            max_bytes=settings.page_cache_max_bytes,
+            ttl_seconds=settings.page_cache_ttl_seconds,
+        )
+    return _page_cache
@@ -0,0 +1,155 @@
+"""Speculative prefetch of pages the agent is likely to browse next."""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+from agent.authority import rank_sources
+from agent.page_cache import CachedPage
+from agent.retry import RetryPolicy, RetryStats
+from agent.urls import canonicalize_url
+
+if TYPE_CHECKING:
+    from agent.tools import WebBrowseTool
+
+logger = logging.getLogger(__name__)
+
+# A wrong guess is cheap to drop, so prefetches never retry
+PREFETCH_RETRY_POLICY = RetryPolicy(max_attempts=1)
+
+
+class Prefetcher:
+    """
+    Fetches the top search results of a run in the background.
+
+    After each ``web_search``, the ``top_k`` results (ranked by authority
+    unless ``rank_by_authority`` is off) start downloading and extracting
+    while the model decides what to do next. A later ``web_browse`` of one
+    of those pages takes the prefetched result instead of fetching again,
+    or joins the download if it is still in flight.
+
+    At most ``max_concurrency`` prefetches run at once, and none start once
+    the run's prefetches have downloaded ``max_bytes``. Prefetched pages
+    the agent never browses are counted as wasted. Fetches go through the
+    same cache, scheduler and circuit breaker as real browses. One
+    instance should be used per run.
+    """
+
+    def __init__(
+        self,
+        browse_tool: "WebBrowseTool",
+        top_k: int,
+        max_bytes: int,
+        max_concurrency: int,
+        rank_by_authority: bool = True,
+    ):
+        """Initialize the prefetcher."""
+        self.browse_tool = browse_tool
+        self.top_k = top_k
+        self.max_bytes = max_bytes
+        self.rank_by_authority = rank_by_authority
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Prefetches not yet taken by a browse, by canonical URL
+        self._pending: dict[str, asyncio.Task] = {}
+
+        self.scheduled = 0
+        self.hits = 0
+        self.joined = 0
+        self.failed = 0
+        self.skipped_budget = 0
+        self.bytes_fetched = 0
+
+    def schedule(self, results: list[dict]) -> int:
+        """
+        Start prefetching the top results of a search.
+
+        Returns:
+            The number of prefetches started
+        """
+        if self.bytes_fetched >= self.max_bytes:
+            return 0
+
+        sources = [r for r in results if isinstance(r, dict) and r.get("url")]
+        ranked = rank_sources(sources, prefer_authority=self.rank_by_authority)
+
+        started = 0
+        for source in ranked[:self.top_k]:
+            url = source["url"]
+            if not url.startswith(("http://", "https://")):
+                continue
+            canonical = canonicalize_url(url)
+            if canonical in self._pending or canonical in self.browse_tool.seen:
+                continue
+            self._pending[canonical] = asyncio.create_task(self._prefetch(url))
+            self.scheduled += 1
+            started += 1
+        return started
+
+    async def _prefetch(self, url: str) -> Optional[tuple[CachedPage, str, dict[str, Any]]]:
+        """Fetch one page, or return None if it failed or the budget ran out."""
+        async with self._semaphore:
+            # Checked at start, so the overshoot is at most one page per slot
+            if self.bytes_fetched >= self.max_bytes:
+                self.skipped_budget += 1
+                return None
+            try:
+                # Kept out of the shared flight so browses never join a no-retry fetch
+                fetched, coalesced = await self.browse_tool.fetch(
+                    url, RetryStats(), policy=PREFETCH_RETRY_POLICY, coalesce=False
+                )
+            except Exception as e:
+                logger.debug(f"Prefetch of {url} failed: {e}")
+                self.failed += 1
+                return None
+
+        if not coalesced:
+            self.bytes_fetched += fetched[2]["bytes_transferred"]
+        return fetched
+
+    async def take(self, url: str) -> Optional[tuple[CachedPage, str, dict[str, Any]]]:
+        """
+        Claim the prefetched result for a page about to be browsed.
+
+        Returns:
+            The page, how it was served and its transfer statistics, or None
+            if the page was not prefetched or the prefetch failed
+        """
+        task = self._pending.pop(canonicalize_url(url), None)
+        if task is None:
+            return None
+
+        if task.done():
+            fetched = None if task.cancelled() else task.result()
+            if fetched is not None:
+                self.hits += 1
+            return fetched
+
+        # Shielded so a cancelled browse doesn't kill the shared download
+        fetched = await asyncio.shield(task)
+        if fetched is not None:
+            self.joined += 1
+        return fetched
+
+    def stats(self) -> dict[str, int]:
+        """Get prefetch counters for the run so far."""
+        wasted = [
+            task.result() for task in self._pending.values()
+            if task.done() and not task.cancelled() and task.result() is not None
+        ]
+        return {
+            "scheduled": self.scheduled,
+            "hits": self.hits,
+            "joined": self.joined,
+            "wasted": len(wasted),
+            "failed": self.failed,
+            "skipped_budget": self.skipped_budget,
+            "bytes_fetched": self.bytes_fetched,
+            "bytes_wasted": sum(f[2]["bytes_transferred"] for f in wasted),
+        }
+
+    async def close(self) -> None:
+        """Cancel prefetches still in flight at the end of the run."""
+        tasks = [task for task in self._pending.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,13 +1,22 @@
 """ReAct Agent implementation for Deep Research Showcase."""
 
+import asyncio
+import hashlib
 import json
 import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import Any, AsyncGenerator, Optional
 from uuid import uuid4
 
+from agent.budget import RunBudget
+from agent.context import ContextManager, SpillEvent
 from agent.model_provider import ChatMessage, ModelProvider, ModelResponse
-from agent.tools import ToolSet, ToolResult
+from agent.tokens import TokenCounter, TokenLedger, get_token_counter
+from agent.tools import ToolResult, ToolRunner
+from agent.urls import canonicalize_url
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +35,7 @@ You have access to powerful research tools:
 - **file_edit**: Make targeted edits (more efficient than full rewrites)
 - **reflect**: Structured reflection on gathered evidence
 - **cross_validate**: Verify claims across multiple sources
+- **context_read**: Re-read older tool outputs that were moved out of the conversation
 
 ## Research Process
 Follow this systematic approach:
@@ -59,14 +69,131 @@ When you have completed your research and written the final report, output it wi
 
 BASELINE_SYSTEM_PROMPT = """You are a helpful research assistant. Answer the user's question based on web search results. Provide sources for your claims and structure your response clearly."""
 
+WRAP_UP_PROMPT = """You are almost out of {budget} budget for this research. Stop researching now and do not call any more tools.
+
+Write the final report from the evidence gathered so far, with the usual structure and citations, inside <report> tags. List anything you could not verify under Conflicts/Uncertainties."""
+
+# How each budget is named in the wrap-up prompt
+BUDGET_NAMES = {"deadline": "time", "tokens": "token", "cost": "cost"}
+
+
+# Tools whose calls must not interleave with other calls on the same state
+STATEFUL_FILE_TOOLS = {"file_write", "file_edit", "file_read"}
+
+
+def tool_lock_key(tool_call: dict) -> Optional[str]:
+    """Get the lock serializing a tool call with related calls, if any."""
+    tool_name = tool_call["function"]["name"]
+    if tool_name == "todo":
+        return "todo"
+    if tool_name in STATEFUL_FILE_TOOLS:
+        try:
+            args = json.loads(tool_call["function"]["arguments"])
+        except json.JSONDecodeError:
+            return None
+        if isinstance(args, dict) and isinstance(args.get("filename"), str):
+            # The file tools resolve names by basename inside the workdir
+            return f"file:{os.path.basename(args['filename'])}"
+    return None
+
+
+def tool_call_ready(tool_call: dict) -> bool:
+    """Check whether a streamed tool call has its name and complete arguments."""
+    func = tool_call["function"]
+    if not func["name"]:
+        return False
+    try:
+        # A JSON object can't be extended once it parses, so it is complete
+        return isinstance(json.loads(func["arguments"]), dict)
+    except json.JSONDecodeError:
+        return False
+
+
+WEB_TOOLS = {"web_search", "web_browse", "batch_web_surfer"}
+DIGEST_PREVIEW_CHARS = 200
+
+
+def web_sources(tool_name: str, output: Any) -> list[dict]:
+    """
+    List the sources in a web tool's output.
+    
+    Each source has ``url``, ``title``, ``snippet`` (the text kept as
+    evidence), ``content`` (the full page text, if browsed) and ``repeat``
+    (whether the page was already read earlier in the run).
+    """
+    sources = []
+    
+    if tool_name in ["web_search", "batch_web_surfer"] and isinstance(output, list):
+        for item in output:
+            if not isinstance(item, dict):
+                continue
+            # From batch_web_surfer
+            if "browsed_content" in item:
+                for content in item.get("browsed_content", []):
+                    sources.append({
+                        "url": content.get("url", ""),
+                        "title": content.get("title", ""),
+                        "snippet": content.get("content", "")[:500],
+                        "content": content.get("content"),
+                        "repeat": bool(content.get("repeat")),
+                    })
+            # From web_search
+            elif "url" in item:
+                sources.append({
+                    "url": item.get("url", ""),
+                    "title": item.get("title", ""),
+                    "snippet": item.get("snippet", ""),
+                    "content": None,
+                    "repeat": False,
+                })
+    
+    elif tool_name == "web_browse" and isinstance(output, dict):
+        sources.append({
+            "url": output.get("url", ""),
+            "title": output.get("title", ""),
+            "snippet": output.get("content", "")[:500],
+            "content": output.get("content"),
+            "repeat": bool(output.get("repeat")),
+        })
+    
+    return sources
+
+
+def tool_digest(tool_name: str, result: ToolResult) -> Optional[str]:
+    """
+    Build a compact stand-in for a tool output that has aged out of history.
+    
+    Web results keep each source's title, URL and evidence snippet; other
+    tools keep a short preview. Failed calls are already short and get no
+    digest.
+    """
+    if not result.success or result.output is None:
+        return None
+    
+    if tool_name in WEB_TOOLS:
+        sources = [
+            {"title": s["title"], "url": s["url"], "snippet": s["snippet"]}
+            for s in web_sources(tool_name, result.output)
+        ]
+        return json.dumps({"compacted": True, "tool": tool_name, "sources": sources})
+    
+    output = json.dumps(result.output)
+    return json.dumps({
+        "compacted": True,
+        "tool": tool_name,
+        "preview": output[:DIGEST_PREVIEW_CHARS],
+    })
+
 
 class AgentState:
     """State management for the ReAct agent."""
     
-    def __init__(self, run_id: str):
+    def __init__(self, run_id: str, token_counter: Optional[TokenCounter] = None):
         """Initialize agent state."""
         self.run_id = run_id
         self.messages: list[ChatMessage] = []
+        # Local token counts of the history, kept current as messages change
+        self.tokens = TokenLedger(token_counter or get_token_counter())
         self.current_phase: str = "planning"
         self.step_count: int = 0
         self.token_usage: dict[str, int] = {
@@ -76,14 +203,101 @@ class AgentState:
         }
         self.tool_calls: list[dict] = []
         self.evidence: list[dict] = []
+        # Positions in ``evidence`` by canonical URL and by content hash
+        self.evidence_by_url: dict[str, int] = {}
+        self.evidence_by_hash: dict[str, int] = {}
+        self.context_spills: list[SpillEvent] = []
+        # Time from each model call to its first tool dispatch, per step with tools
+        self.first_action_ms: list[int] = []
+        self.tool_digests: dict[str, str] = {}
+        self.history_tokens_saved: int = 0
         self.claims: list[dict] = []
         self.report_drafts: list[str] = []
+        # The budget that ended the research, once the agent is wrapping up
+        self.wrap_up_reason: Optional[str] = None
         self.is_complete: bool = False
         self.error: Optional[str] = None
     
     def add_message(self, message: ChatMessage) -> None:
-        """Add a message to the history."""
+        """Add a message to the history, counting its tokens once."""
         self.messages.append(message)
+        self.tokens.add(message)
+    
+    def replace_message_content(self, message: ChatMessage, content: Optional[str]) -> int:
+        """Rewrite a message in the history, returning the tokens saved."""
+        return self.tokens.replace_content(message, content)
+    
+    def add_evidence(
+        self,
+        url: str,
+        title: str,
+        snippet: str,
+        content: Optional[str] = None,
+        tool_call_id: Optional[str] = None,
+    ) -> bool:
+        """Record evidence, merging it into the item for the same page if there is one.
+        
+        A page is the same if its canonical URL or its content matches an
+        earlier item. A repeat bumps that item's ``hit_count``, fills in a
+        missing title or content and keeps the longer snippet.
+        
+        ``content`` is the full source text; the runner moves it into the
+        blob store when the evidence is saved.
+        
+        Returns:
+            Whether a new evidence item was added
+        """
+        canonical = canonicalize_url(url) if url else ""
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest() if content else None
+        
+        index = self.evidence_by_url.get(canonical) if canonical else None
+        if index is None and content_hash:
+            index = self.evidence_by_hash.get(content_hash)
+        
+        if index is None:
+            index = len(self.evidence)
+            self.evidence.append({
+                "source_url": url,
+                "source_title": title,
+                "snippet": snippet,
+                "content": content,
+                "content_hash": content_hash,
+                "hit_count": 1,
+                "tool_call_id": tool_call_id,
+                "retrieved_at": datetime.utcnow().isoformat(),
+            })
+            self._index_evidence(index)
+            return True
+        
+        item = self.evidence[index]
+        item["hit_count"] = item.get("hit_count", 1) + 1
+        if title and not item.get("source_title"):
+            item["source_title"] = title
+        if len(snippet or "") > len(item.get("snippet") or ""):
+            item["snippet"] = snippet
+        if content_hash and not item.get("content_hash"):
+            item["content"] = content
+            item["content_hash"] = content_hash
+        if canonical:
+            self.evidence_by_url.setdefault(canonical, index)
+        if content_hash:
+            self.evidence_by_hash.setdefault(content_hash, index)
+        return False
+    
+    def _index_evidence(self, index: int) -> None:
+        """Add an evidence item to the lookup tables."""
+        item = self.evidence[index]
+        if item.get("source_url"):
+            self.evidence_by_url.setdefault(canonicalize_url(item["source_url"]), index)
+        if item.get("content_hash"):
+            self.evidence_by_hash.setdefault(item["content_hash"], index)
+    
+    def reindex_evidence(self) -> None:
+        """Rebuild the evidence lookup tables, e.g. after restoring a checkpoint."""
+        self.evidence_by_url.clear()
+        self.evidence_by_hash.clear()
+        for index in range(len(self.evidence)):
+            self._index_evidence(index)
     
     def update_usage(self, usage: dict[str, int]) -> None:
         """Update token usage."""
@@ -92,22 +306,97 @@ class AgentState:
                 self.token_usage[key] += value
 
 
+class ToolDispatcher:
+    """
+    Runs one turn's tool calls, starting each as soon as it is known.
+    
+    With a streamed response, calls are dispatched while the model is still
+    writing the rest of its turn; ``gather`` then starts any stragglers and
+    waits for all of them. Calls that touch the same state (the same file,
+    or the todo list) share a lock and run one at a time in the order the
+    model issued them; everything else runs in parallel, so a step takes as
+    long as its slowest call.
+    """
+    
+    def __init__(self, agent: "ReActAgent", state: AgentState):
+        """Initialize the dispatcher for one step."""
+        self.agent = agent
+        self.state = state
+        self.started = time.perf_counter()
+        self.first_action_ms: Optional[int] = None
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Keyed by the call's position in the turn; streamed ids can be empty
+        self._tasks: dict[int, asyncio.Task] = {}
+    
+    def is_dispatched(self, index: int) -> bool:
+        """Check whether the call at a position has been started."""
+        return index in self._tasks
+    
+    def dispatch(self, index: int, tool_call: dict) -> None:
+        """Start the call at a position, unless it is already running."""
+        if index in self._tasks:
+            return
+        if self.first_action_ms is None:
+            self.first_action_ms = int((time.perf_counter() - self.started) * 1000)
+        # Copy it; a streaming provider keeps updating the dicts it yields
+        tool_call = {**tool_call, "function": dict(tool_call["function"])}
+        self._tasks[index] = asyncio.create_task(self._run(tool_call))
+    
+    async def _run(self, tool_call: dict) -> tuple[ToolResult, str]:
+        """Execute one call under its lock, if it has one."""
+        key = tool_lock_key(tool_call)
+        if key is None:
+            started_at = datetime.utcnow().isoformat()
+            return await self.agent._execute_tool_call(tool_call, self.state), started_at
+        # Tasks start in order and the lock is FIFO, preserving call order per key
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            started_at = datetime.utcnow().isoformat()
+            return await self.agent._execute_tool_call(tool_call, self.state), started_at
+    
+    async def gather(self, tool_calls: list[dict]) -> list[tuple[ToolResult, str]]:
+        """
+        Start any calls not yet dispatched and wait for all of them.
+        
+        Returns:
+            (result, start timestamp) for each call, in the original order
+        """
+        for index, tool_call in enumerate(tool_calls):
+            self.dispatch(index, tool_call)
+        tasks = [self._tasks[index] for index in range(len(tool_calls))]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            self.cancel()
+            raise
+    
+    def cancel(self) -> None:
+        """Cancel every call still running, once the step has failed."""
+        for task in self._tasks.values():
+            task.cancel()
+
+
 class ReActAgent:
     """ReAct (Reasoning + Acting) agent for deep research."""
     
     def __init__(
         self,
         provider: ModelProvider,
-        toolset: ToolSet,
+        toolset: ToolRunner,
         max_steps: int = 50,
         system_prompt: Optional[str] = None,
         is_baseline: bool = False,
+        context_manager: Optional[ContextManager] = None,
+        stream: bool = True,
+        budget: Optional[RunBudget] = None,
     ):
         """Initialize the ReAct agent."""
         self.provider = provider
         self.toolset = toolset
         self.max_steps = max_steps
         self.is_baseline = is_baseline
+        self.context_manager = context_manager
+        self.stream = stream
+        self.budget = budget
         
         if system_prompt:
             self.system_prompt = system_prompt
@@ -120,44 +409,93 @@ class ReActAgent:
         self,
         query: str,
         state: AgentState,
-        on_step: Optional[callable] = None,
+        on_step: Optional[Callable[[AgentState], Awaitable[None]]] = None,
+        on_delta: Optional[Callable[[AgentState, str], Awaitable[None]]] = None,
     ) -> AgentState:
-        """Run the agent on a research query."""
+        """
+        Run the agent on a research query.
+        
+        ``on_step(state)`` is awaited after every step. When streaming,
+        ``on_delta(state, text)`` is awaited with each new piece of
+        assistant text as it arrives.
+        
+        With a budget, the agent switches to writing its report once any
+        budget is nearly used up: the model is told to wrap up and gets no
+        tools, and whatever it writes becomes the report.
+        """
         
-        # Initialize with system prompt and user query
-        state.add_message(ChatMessage(role="system", content=self.system_prompt))
-        state.add_message(ChatMessage(role="user", content=query))
+        if self.budget is not None:
+            self.budget.start()
+        
+        # Initialize with system prompt and user query, unless resuming
+        if not state.messages:
+            state.add_message(ChatMessage(role="system", content=self.system_prompt))
+            state.add_message(ChatMessage(role="user", content=query))
         
         while state.step_count < self.max_steps and not state.is_complete:
             try:
+                # Stop once a budget is spent and the report step has had its chance
+                if self.budget is not None:
+                    self.budget.update(state.token_usage)
+                    if state.wrap_up_reason and self.budget.exhausted:
+                        logger.warning(f"Run {state.run_id} stopped: {state.wrap_up_reason} budget exhausted")
+                        break
+                
                 state.step_count += 1
                 logger.info(f"Step {state.step_count}/{self.max_steps}")
                 
                 # Determine current phase based on step and todo state
                 state.current_phase = self._determine_phase(state)
                 
-                # Get model response
-                response = await self.provider.chat_completion(
-                    messages=state.messages,
-                    tools=self.toolset.get_all_schemas(),
-                    temperature=0.7,
-                    max_tokens=4000,
-                )
+                if self.budget is not None and not state.wrap_up_reason and self.budget.nearly_exhausted:
+                    self._start_wrap_up(state, self.budget)
+                if state.wrap_up_reason:
+                    state.current_phase = "report_generation"
+                
+                # Compact aged tool outputs and keep the prompt under budget
+                if self.context_manager:
+                    state.history_tokens_saved += await self.context_manager.compact(
+                        state.messages, state.tool_digests, state.tokens
+                    )
+                    state.context_spills.extend(
+                        await self.context_manager.fit(state.messages, state.tokens)
+                    )
+                
+                # Get model response, starting tool calls as they stream in
+                tools = None if state.wrap_up_reason else self.toolset.get_all_schemas()
+                dispatcher = ToolDispatcher(self, state)
+                if self.stream:
+                    try:
+                        response = await self._stream_response(state, tools, dispatcher, on_delta)
+                    except BaseException:
+                        dispatcher.cancel()
+                        raise
+                else:
+                    response = await self.provider.chat_completion(
+                        messages=state.messages,
+                        tools=tools,
+                        temperature=0.7,
+                        max_tokens=4000,
+                    )
                 
-                # Update token usage
-                state.update_usage(response.usage)
+                # Update token usage, counting locally if the API reported none
+                usage = response.usage
+                if not usage.get("total_tokens"):
+                    usage = self._estimate_usage(state, response)
+                state.update_usage(usage)
                 
                 # Add assistant message to history
                 state.add_message(response.message)
                 
                 # Check for tool calls
                 if response.has_tool_calls:
-                    # Execute tool calls
-                    for tool_call in response.message.tool_calls:
-                        tool_result = await self._execute_tool_call(
-                            tool_call, state
-                        )
-                        
+                    # Execute tool calls concurrently, then record them in order
+                    tool_calls = response.message.tool_calls or []
+                    results = await dispatcher.gather(tool_calls)
+                    if dispatcher.first_action_ms is not None:
+                        state.first_action_ms.append(dispatcher.first_action_ms)
+                    
+                    for tool_call, (tool_result, started_at) in zip(tool_calls, results, strict=True):
                         # Add tool result to messages
                         state.add_message(ChatMessage(
                             role="tool",
@@ -167,15 +505,22 @@ class ReActAgent:
                         
                         # Track tool call
                         state.tool_calls.append({
+                            "id": tool_call["id"],
                             "tool": tool_call["function"]["name"],
                             "args": tool_call["function"]["arguments"],
                             "success": tool_result.success,
-                            "timestamp": datetime.utcnow().isoformat(),
+                            "result": tool_result.output,
+                            "error": tool_result.error,
+                            "timestamp": started_at,
                         })
                         
                         # Extract evidence from web results
                         if tool_result.success:
                             self._extract_evidence(tool_call, tool_result, state)
+                        
+                        digest = tool_digest(tool_call["function"]["name"], tool_result)
+                        if digest is not None:
+                            state.tool_digests[tool_call["id"]] = digest
                 else:
                     # No tool calls - check if report is complete
                     if response.message.content:
@@ -189,6 +534,10 @@ class ReActAgent:
                             end = content.index("</report>")
                             report = content[start:end].strip()
                             state.report_drafts.append(report)
+                        elif state.wrap_up_reason:
+                            # Out of budget; what the model wrote is the report
+                            state.is_complete = True
+                            state.report_drafts.append(content)
                         elif response.finish_reason == "stop" and state.step_count > 5:
                             # Consider complete if model stops naturally after some work
                             if len(content) > 1000:  # Substantial response
@@ -214,6 +563,64 @@ class ReActAgent:
         
         return state
     
+    def _start_wrap_up(self, state: AgentState, budget: RunBudget) -> None:
+        """Tell the model to stop researching and write the report."""
+        most_used = budget.most_used()
+        if most_used is None:
+            return
+        reason, fraction = most_used
+        state.wrap_up_reason = reason
+        logger.info(f"Run {state.run_id} wrapping up: {fraction:.0%} of {reason} budget used")
+        state.add_message(ChatMessage(
+            role="user",
+            content=WRAP_UP_PROMPT.format(budget=BUDGET_NAMES.get(reason, reason)),
+        ))
+    
+    def _estimate_usage(self, state: AgentState, response: ModelResponse) -> dict[str, int]:
+        """Estimate a response's token usage from the local token counts."""
+        prompt_tokens = state.tokens.total
+        completion_tokens = state.tokens.counter.count_message(response.message)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+    
+    async def _stream_response(
+        self,
+        state: AgentState,
+        tools: Optional[list[dict]],
+        dispatcher: ToolDispatcher,
+        on_delta: Optional[Callable[[AgentState, str], Awaitable[None]]] = None,
+    ) -> ModelResponse:
+        """
+        Stream one model response, dispatching tool calls as they complete.
+        
+        Returns:
+            The complete response
+        """
+        response: Optional[ModelResponse] = None
+        streamed_chars = 0
+        
+        async for response in self.provider.chat_completion_stream(
+            messages=state.messages,
+            tools=tools,
+            temperature=0.7,
+            max_tokens=4000,
+        ):
+            content = response.message.content or ""
+            if on_delta and len(content) > streamed_chars:
+                await on_delta(state, content[streamed_chars:])
+            streamed_chars = len(content)
+            
+            for index, tool_call in enumerate(response.message.tool_calls or []):
+                if not dispatcher.is_dispatched(index) and tool_call_ready(tool_call):
+                    dispatcher.dispatch(index, tool_call)
+        
+        if response is None:
+            raise RuntimeError("Model returned an empty stream")
+        return response
+    
     async def _execute_tool_call(
         self,
         tool_call: dict,
@@ -267,39 +674,18 @@ class ReActAgent:
     ) -> None:
         """Extract evidence from tool results."""
         tool_name = tool_call["function"]["name"]
+        call_id = tool_call.get("id")
         
-        if tool_name in ["web_search", "batch_web_surfer"]:
-            output = result.output
-            if isinstance(output, list):
-                for item in output:
-                    if isinstance(item, dict):
-                        # From batch_web_surfer
-                        if "browsed_content" in item:
-                            for content in item.get("browsed_content", []):
-                                state.evidence.append({
-                                    "source_url": content.get("url", ""),
-                                    "source_title": content.get("title", ""),
-                                    "snippet": content.get("content", "")[:500],
-                                    "retrieved_at": datetime.utcnow().isoformat(),
-                                })
-                        # From web_search
-                        elif "url" in item:
-                            state.evidence.append({
-                                "source_url": item.get("url", ""),
-                                "source_title": item.get("title", ""),
-                                "snippet": item.get("snippet", ""),
-                                "retrieved_at": datetime.utcnow().isoformat(),
-                            })
-        
-        elif tool_name == "web_browse":
-            output = result.output
-            if isinstance(output, dict):
-                state.evidence.append({
-                    "source_url": output.get("url", ""),
-                    "source_title": output.get("title", ""),
-                    "snippet": output.get("content", "")[:500],
-                    "retrieved_at": datetime.utcnow().isoformat(),
-                })
+        if tool_name in WEB_TOOLS:
+            # Repeat visits are merged into the page's evidence as extra hits
+            for source in web_sources(tool_name, result.output):
+                state.add_evidence(
+                    source["url"],
+                    source["title"],
+                    source["snippet"],
+                    content=source["content"],
+                    tool_call_id=call_id,
+                )
         
         elif tool_name == "cross_validate":
             output = result.output
@@ -0,0 +1,219 @@
+"""Retry policy and per-host circuit breaker for outbound tool calls."""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import httpx
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a host's circuit is open and calls fail fast."""
+
+    def __init__(self, key: str, retry_in: float):
+        super().__init__(
+            f"{key} is failing repeatedly; skipping it for another {retry_in:.0f}s"
+        )
+        self.key = key
+        self.retry_in = retry_in
+
+
+@dataclass
+class RetryPolicy:
+    """Jittered exponential backoff for idempotent calls."""
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number ``attempt`` (1-based), with full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+@dataclass
+class RetryStats:
+    """Retry bookkeeping for a single call, reported in tool metadata."""
+    retries: int = 0
+    last_error: Optional[str] = None
+
+
+@dataclass
+class _Circuit:
+    """Failure state for one key."""
+    failures: int = 0
+    opened_at: Optional[float] = None
+    probing: bool = False
+
+
+class CircuitBreaker:
+    """
+    Per-key circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``cooldown_seconds``. The first call after the
+    cooldown is let through as a probe; its success closes the circuit and
+    its failure re-opens it for another cooldown. A probe cancelled before
+    it finishes says nothing about the host, so the next call probes again.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        """Initialize the circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._circuits: dict[str, _Circuit] = {}
+
+    def check(self, key: str) -> bool:
+        """
+        Raise CircuitOpenError if calls to the key should fail fast.
+
+        Returns:
+            Whether the call is the probe of a circuit past its cooldown
+        """
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.opened_at is None:
+            return False
+
+        elapsed = time.monotonic() - circuit.opened_at
+        if elapsed < self.cooldown_seconds or circuit.probing:
+            raise CircuitOpenError(key, max(0.0, self.cooldown_seconds - elapsed))
+        circuit.probing = True
+        return True
+
+    def release_probe(self, key: str) -> None:
+        """Let another call probe a key whose probe ended without a result."""
+        circuit = self._circuits.get(key)
+        if circuit is not None:
+            circuit.probing = False
+
+    def record_success(self, key: str) -> None:
+        """Close the circuit for a key."""
+        self._circuits.pop(key, None)
+
+    def record_failure(self, key: str) -> None:
+        """Count a failure, opening the circuit at the threshold."""
+        circuit = self._circuits.setdefault(key, _Circuit())
+        circuit.failures += 1
+        if circuit.probing or circuit.failures >= self.failure_threshold:
+            if circuit.opened_at is None or circuit.probing:
+                logger.warning(f"Opening circuit for {key} after {circuit.failures} failures")
+            circuit.opened_at = time.monotonic()
+            circuit.probing = False
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get the state of all tracked keys."""
+        now = time.monotonic()
+        return {
+            key: {
+                "failures": c.failures,
+                "open": c.opened_at is not None
+                and now - c.opened_at < self.cooldown_seconds,
+            }
+            for key, c in self._circuits.items()
+        }
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Check whether an error is transient and worth retrying."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError))
+
+
+def counts_as_failure(exc: BaseException) -> bool:
+    """Check whether an error indicates the host itself is unhealthy."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError))
+
+
+async def call_with_retry(
+    fn: Callable[[], Awaitable[Any]],
+    key: str,
+    stats: Optional[RetryStats] = None,
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+) -> Any:
+    """
+    Call ``fn`` with retries on transient errors, guarded by a circuit breaker.
+
+    Args:
+        fn: Zero-argument coroutine factory; must be safe to repeat
+        key: Circuit breaker key (usually the host)
+        stats: Optional RetryStats updated with the retry count
+        policy: Retry policy (defaults to the configured policy)
+        breaker: Circuit breaker (defaults to the shared breaker)
+
+    Raises:
+        CircuitOpenError: If the key's circuit is open
+        Exception: The last error once retries are exhausted
+    """
+    policy = policy or get_retry_policy()
+    breaker = breaker or get_circuit_breaker()
+    stats = stats or RetryStats()
+
+    attempt = 0
+    while True:
+        attempt += 1
+        probe = breaker.check(key)
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            if probe:
+                breaker.release_probe(key)
+            raise
+        except Exception as e:
+            if counts_as_failure(e):
+                breaker.record_failure(key)
+            else:
+                # The host answered, even if with an error, so it is healthy
+                breaker.record_success(key)
+            if not is_retryable(e) or attempt >= policy.max_attempts:
+                raise
+            stats.retries += 1
+            stats.last_error = str(e) or type(e).__name__
+            delay = policy.backoff(attempt)
+            logger.info(f"Retrying {key} in {delay:.2f}s after: {stats.last_error}")
+            await asyncio.sleep(delay)
+        else:
+            breaker.record_success(key)
+            return result
+
+
+# Global retry policy and circuit breaker
+_policy: Optional[RetryPolicy] = None
+_breaker: Optional[CircuitBreaker] = None
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Get the configured retry policy."""
+    global _policy
+    if _policy is None:
+        settings = get_settings()
+        _policy = RetryPolicy(
+            max_attempts=settings.retry_max_attempts,
+            base_delay=settings.retry_base_delay_seconds,
+            max_delay=settings.retry_max_delay_seconds,
+        )
+    return _policy
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get the shared circuit breaker."""
+    global _breaker
+    if _breaker is None:
+        settings = get_settings()
+        _breaker = CircuitBreaker(
+            failure_threshold=settings.circuit_failure_threshold,
+            cooldown_seconds=settings.circuit_cooldown_seconds,
+        )
+    return _breaker
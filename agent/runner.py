@@ -9,15 +9,22 @@ from pathlib import Path
 from typing import Any, Optional
 
 from agent.authority import evaluate_source_authority, get_authority_summary, rank_sources
-from agent.model_provider import OpenAIProvider, get_provider
+from agent.blobstore import get_blob_store
+from agent.budget import RunBudget, estimate_cost
+from agent.cassette import Cassette, CassetteProvider, CassetteToolSet, cassette_path
+from agent.checkpoint import CHECKPOINT_FILE, Checkpointer
+from agent.context import ContextManager
+from agent.model_provider import ModelProvider, OpenAIProvider, get_provider
 from agent.react_agent import AgentState, ReActAgent
-from agent.tools import ToolSet
+from agent.tokens import load_token_counter
+from agent.tools import ToolRunner, ToolSet
 
 from backend.config import get_settings
 from backend.database import Database
 from backend.models import (
     AgentPhase,
     AuthorityTier,
+    CassetteMode,
     Claim,
     ClaimStatus,
     Evidence,
@@ -68,44 +75,99 @@ class AgentRunner:
             ablations=self.ablations,
         )
         
-        # Initialize model provider
-        self.provider = get_provider(
-            engine_type=run.config.engine.value,
-            model_name=run.config.model_name,
-            base_url=run.config.model_base_url,
-        )
+        # Initialize model provider, recording or replaying every model and
+        # tool call through a cassette if asked to
+        self.provider: ModelProvider
+        tools: ToolRunner = self.toolset
+        cassette_mode = run.config.cassette_mode
+        if cassette_mode == CassetteMode.OFF:
+            self.provider = self._create_provider()
+        else:
+            cassette = Cassette(
+                cassette_path(run.config.cassette_name or run.run_id),
+                mode=cassette_mode.value,
+                latency_scale=run.config.cassette_latency_scale,
+            )
+            # A replayed run never calls the model
+            self.provider = CassetteProvider(
+                None if cassette_mode == CassetteMode.REPLAY else self._create_provider(),
+                cassette,
+            )
+            tools = CassetteToolSet(self.toolset, cassette)
         
         # Initialize agent
         is_baseline = run.config.engine.value == "baseline"
+        context_manager = None
+        if self.settings.enable_disk_context or run.config.compact_history:
+            context_manager = ContextManager(
+                workdir=str(self.workdir),
+                max_tokens=self.settings.max_context_tokens,
+                keep_tool_outputs=run.config.keep_tool_outputs if run.config.compact_history else None,
+                spill_to_disk=self.settings.enable_disk_context,
+            )
+        self.budget = RunBudget(
+            model=run.config.model_name or self.settings.default_model,
+            deadline_seconds=run.config.deadline_seconds,
+            max_tokens=run.config.max_total_tokens,
+            max_cost_usd=run.config.max_cost_usd,
+            wrap_up_fraction=self.settings.budget_wrap_up_fraction,
+        )
         self.agent = ReActAgent(
             provider=self.provider,
-            toolset=self.toolset,
+            toolset=tools,
             max_steps=run.config.max_steps,
             is_baseline=is_baseline,
+            context_manager=context_manager,
+            stream=run.config.stream_responses,
+            budget=self.budget if self.budget.enabled else None,
         )
         
         # Metrics tracking
         self.start_time: Optional[datetime] = None
         self.tool_event_count = 0
+        self.tool_event_ids: dict[str, str] = {}
+        self.context_spill_count = 0
+        self.blob_store = get_blob_store()
+        self.checkpointer = Checkpointer(self.workdir / CHECKPOINT_FILE, self.blob_store)
         self.patch_edit_savings: list[float] = []
     
-    async def execute(self) -> None:
-        """Execute the research run."""
+    def _create_provider(self) -> ModelProvider:
+        """Create the model provider the run is configured for."""
+        return get_provider(
+            engine_type=self.run.config.engine.value,
+            model_name=self.run.config.model_name,
+            base_url=self.run.config.model_base_url,
+        )
+    
+    async def execute(self, resume: bool = False) -> None:
+        """Execute the research run, or continue it from its checkpoint."""
         self.start_time = datetime.utcnow()
         
         # Create agent state
-        state = AgentState(run_id=self.run.run_id)
+        state = AgentState(
+            run_id=self.run.run_id,
+            token_counter=await load_token_counter(self.run.config.model_name),
+        )
+        elapsed_seconds = 0.0
+        if resume:
+            elapsed_seconds = await self._restore_checkpoint(state)
+        self.budget.start(elapsed_seconds)
         
         try:
             # Emit phase change
             await self.emitter.phase_changed("planning", "Breaking down research question")
             
             # Run the agent
-            final_state = await self.agent.run(
-                query=self.run.query,
-                state=state,
-                on_step=self._on_step,
-            )
+            try:
+                final_state = await self.agent.run(
+                    query=self.run.query,
+                    state=state,
+                    on_step=self._on_step,
+                    on_delta=self._on_delta,
+                )
+            finally:
+                # Nothing browses once the agent stops; drop unfinished prefetches
+                await self.toolset.close()
             
             # Process results
             await self._process_results(final_state)
@@ -117,6 +179,58 @@ class AgentRunner:
             await self.db.update_run(self.run)
             raise
     
+    async def _restore_checkpoint(self, state: AgentState) -> float:
+        """
+        Load the run's checkpoint into a fresh state.
+        
+        Returns:
+            Wall-clock seconds the run had already spent
+        """
+        restored = self.checkpointer.restore(state)
+        if restored is None:
+            logger.info(f"No checkpoint for run {self.run.run_id}, starting over")
+            return 0.0
+        
+        # Tool events, spills and evidence content were saved before the checkpoint
+        self.tool_event_count = len(state.tool_calls)
+        self.tool_event_ids = {
+            tc["id"]: tc["event_id"] for tc in state.tool_calls if tc.get("id") and tc.get("event_id")
+        }
+        self.context_spill_count = len(state.context_spills)
+        if restored["todo"] is not None:
+            self.toolset.restore_todo_state(restored["todo"])
+        if self.agent.context_manager:
+            self.agent.context_manager.mark_spilled(restored["compacted"])
+        if self.run.forked_from_step is not None and state.step_count == self.run.forked_from_step:
+            await self._replay_file_edits(state)
+        
+        logger.info(f"Resuming run {self.run.run_id} after step {state.step_count}")
+        return restored["elapsed_seconds"]
+    
+    async def _replay_file_edits(self, state: AgentState) -> None:
+        """
+        Rebuild the files of a forked run as they were at the fork step.
+        
+        The parent's working directory holds the files at the end of the
+        parent run, so the fork redoes the parent's successful writes and
+        edits up to the fork step instead of copying them.
+        """
+        replayed = 0
+        for tool_call in state.tool_calls:
+            if tool_call.get("tool") not in ("file_write", "file_edit") or not tool_call.get("success"):
+                continue
+            try:
+                args = json.loads(tool_call.get("args") or "{}")
+            except json.JSONDecodeError:
+                continue
+            result = await self.toolset.execute(tool_call["tool"], **args)
+            if not result.success:
+                logger.warning(f"Replaying {tool_call['tool']} for fork failed: {result.error}")
+            replayed += 1
+        
+        if replayed:
+            logger.info(f"Replayed {replayed} file edits into fork {self.run.run_id}")
+    
     async def _on_step(self, state: AgentState) -> None:
         """Callback for each agent step."""
         # Update phase
@@ -133,6 +247,11 @@ class AgentRunner:
             await self._record_tool_event(tool_call)
             self.tool_event_count += 1
         
+        # Report context spills
+        for spill in state.context_spills[self.context_spill_count:]:
+            await self.emitter.context_spill(spill.file_path or "", spill.summary)
+            self.context_spill_count += 1
+        
         # Update todo state if available
         todo_state = self.toolset.get_todo_state()
         if todo_state:
@@ -144,6 +263,17 @@ class AgentRunner:
         
         # Update metrics
         await self._update_metrics(state)
+        
+        # Checkpoint what the step changed
+        await self.checkpointer.write_step(
+            state,
+            todo_items=todo_state["items"] if todo_state else None,
+            elapsed_seconds=self.budget.elapsed_seconds,
+        )
+    
+    async def _on_delta(self, state: AgentState, delta: str) -> None:
+        """Callback for streamed assistant text."""
+        await self.emitter.assistant_delta(state.step_count, delta)
     
     async def _record_tool_event(self, tool_call: dict) -> None:
         """Record a tool event to the database."""
@@ -155,6 +285,7 @@ class AgentRunner:
             "web_browse": ToolType.WEB_BROWSE,
             "batch_web_surfer": ToolType.WEB_SEARCH,
             "file_read": ToolType.FILE_READ,
+            "context_read": ToolType.FILE_READ,
             "file_write": ToolType.FILE_WRITE,
             "file_edit": ToolType.FILE_EDIT,
             "todo": ToolType.TODO,
@@ -163,17 +294,26 @@ class AgentRunner:
         
         tool_type = tool_type_map.get(tool_name, ToolType.WEB_SEARCH)
         
+        # The full result is kept by the agent only until it is stored here
+        result, result_file_path = await self._store_tool_result(tool_call.pop("result", None))
+        
         event = ToolEvent(
             event_id=str(uuid.uuid4()),
             run_id=self.run.run_id,
             tool=tool_type,
             tool_name=tool_name,
             args=json.loads(tool_call.get("args", "{}")) if isinstance(tool_call.get("args"), str) else {},
+            result=result,
+            result_file_path=result_file_path,
             started_at=datetime.fromisoformat(tool_call.get("timestamp", datetime.utcnow().isoformat())),
             ended_at=datetime.utcnow(),
+            error=tool_call.get("error"),
         )
         
         await self.db.create_tool_event(event)
+        tool_call["event_id"] = event.event_id
+        if tool_call.get("id"):
+            self.tool_event_ids[tool_call["id"]] = event.event_id
         
         # Emit WebSocket event
         await self.emitter.tool_call_completed(
@@ -183,6 +323,23 @@ class AgentRunner:
             duration_ms=0,
         )
     
+    async def _store_tool_result(self, result: Any) -> tuple[Any, Optional[str]]:
+        """
+        Keep small tool results inline and move large ones to the blob store.
+        
+        Returns:
+            The value to store on the tool event and the blob path, if any
+        """
+        if result is None:
+            return None, None
+        
+        size = len(json.dumps(result, ensure_ascii=False))
+        if size <= self.settings.blob_inline_max_bytes:
+            return result, None
+        
+        ref, size = await self.blob_store.put_json(result)
+        return {"blob": ref, "bytes": size}, str(self.blob_store.path_for(ref))
+    
     async def _update_metrics(self, state: AgentState) -> None:
         """Update run metrics."""
         end_time = datetime.utcnow()
@@ -201,9 +358,20 @@ class AgentRunner:
         # Calculate patch edit savings
         avg_savings = sum(self.patch_edit_savings) / len(self.patch_edit_savings) if self.patch_edit_savings else None
         
-        # Estimate cost (simplified - would need actual token counts and pricing)
+        # Time to first action across steps that called tools
+        first_action = state.first_action_ms
+        avg_first_action = sum(first_action) // len(first_action) if first_action else None
+        
+        # Estimate cost from the model's list price
         total_tokens = state.token_usage.get("total_tokens", 0)
-        cost_estimate = total_tokens * 0.00001  # Very rough estimate
+        cost_estimate = estimate_cost(
+            self.budget.model,
+            state.token_usage.get("prompt_tokens", 0),
+            state.token_usage.get("completion_tokens", 0),
+        )
+        
+        self.budget.update(state.token_usage)
+        budget = {**self.budget.snapshot(), "wrap_up_reason": state.wrap_up_reason}
         
         self.run.metrics = RunMetrics(
             total_tool_calls=len(state.tool_calls),
@@ -216,10 +384,19 @@ class AgentRunner:
             reflection_steps=reflection_steps,
             cross_validation_events=cross_validation_events,
             patch_edit_savings_percent=avg_savings,
+            avg_time_to_first_action_ms=avg_first_action,
+            budget=budget,
+            prefetch=self.toolset.get_prefetch_stats() or {},
+            context_spill_to_disk_events=len(state.context_spills),
+            history_tokens_saved=state.history_tokens_saved,
+            context_tokens=state.tokens.total,
+            context_tokens_by_tool=dict(state.tokens.by_tool),
         )
         
         await self.db.update_run(self.run)
         await self.emitter.metrics_updated(self.run.metrics.model_dump())
+        if self.budget.enabled:
+            await self.emitter.budget_updated(budget)
     
     async def _process_results(self, state: AgentState) -> None:
         """Process the final results from the agent."""
@@ -243,6 +420,12 @@ class AgentRunner:
         for evidence_data in state.evidence:
             url = evidence_data.get("source_url", "")
             
+            # Checkpointed evidence already has its content in the blob store
+            content = evidence_data.pop("content", None)
+            content_ref = evidence_data.get("content_ref")
+            if content_ref is None and content:
+                content_ref = await self.blob_store.put(content)
+            
             # Evaluate authority if enabled
             if self.ablations.get("enable_authority_ranking", True):
                 authority = evaluate_source_authority(url)
@@ -258,6 +441,9 @@ class AgentRunner:
                 snippet=evidence_data.get("snippet", ""),
                 authority_tier=tier,
                 retrieved_at=datetime.fromisoformat(evidence_data.get("retrieved_at", datetime.utcnow().isoformat())),
+                tool_event_id=self.tool_event_ids.get(evidence_data.get("tool_call_id", "")),
+                content_ref=content_ref,
+                hit_count=evidence_data.get("hit_count", 1),
             )
             
             await self.db.create_evidence(evidence)
@@ -0,0 +1,220 @@
+"""Outbound request scheduler enforcing per-domain and per-backend rate limits."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitedError(Exception):
+    """Raised when a key is throttled for longer than callers may wait."""
+
+    def __init__(self, key: str, retry_after: float):
+        super().__init__(f"{key} is rate limited, retry after {retry_after:.0f}s")
+        self.key = key
+        self.retry_after = retry_after
+
+
+@dataclass
+class TokenBucket:
+    """
+    Reservation-based token bucket.
+
+    Tokens may go negative: each acquisition reserves the next token and is
+    told how long to sleep until it is due, which keeps waiters in FIFO
+    order without a queue.
+    """
+    rate: float
+    capacity: float
+    tokens: float = 0.0
+    updated: float = field(default_factory=time.monotonic)
+    blocked_until: float = 0.0
+
+    def __post_init__(self):
+        self.tokens = self.capacity
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token would be available, without reserving it."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        token_wait = max(0.0, (1 - self.tokens) / self.rate)
+        return max(token_wait, self.blocked_until - now)
+
+    def reserve(self, now: float) -> float:
+        """Reserve a token and return how long to wait before using it."""
+        wait = self.delay(now)
+        self.tokens -= 1
+        return wait
+
+
+@dataclass
+class KeyStats:
+    """Counters for one scheduler key."""
+    queue_depth: int = 0
+    requests: int = 0
+    throttled: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+class OutboundScheduler:
+    """
+    Shared scheduler for all outbound traffic.
+
+    Keys are ``domain:<host>`` for page fetches and ``search:<backend>`` for
+    search engines, each with its own token bucket. ``defer`` pushes a key's
+    next slot out, which is how ``Retry-After`` and rate-limit errors are
+    honored across every run in the process.
+    """
+
+    def __init__(
+        self,
+        domain_rate: float,
+        domain_burst: int,
+        search_rate: float,
+        search_burst: int,
+        max_wait_seconds: float,
+    ):
+        """Initialize the scheduler."""
+        self.domain_rate = domain_rate
+        self.domain_burst = domain_burst
+        self.search_rate = search_rate
+        self.search_burst = search_burst
+        self.max_wait_seconds = max_wait_seconds
+
+        self._buckets: dict[str, TokenBucket] = {}
+        self._stats: dict[str, KeyStats] = {}
+
+    def _bucket(self, key: str) -> TokenBucket:
+        """Get or create the bucket for a key."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if key.startswith("search:"):
+                bucket = TokenBucket(rate=self.search_rate, capacity=self.search_burst)
+            else:
+                bucket = TokenBucket(rate=self.domain_rate, capacity=self.domain_burst)
+            self._buckets[key] = bucket
+            self._stats[key] = KeyStats()
+        return bucket
+
+    async def acquire(self, key: str) -> float:
+        """
+        Wait for a slot on a key.
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitedError: If the wait would exceed ``max_wait_seconds``
+        """
+        bucket = self._bucket(key)
+        stats = self._stats[key]
+        now = time.monotonic()
+
+        if bucket.delay(now) > self.max_wait_seconds:
+            stats.throttled += 1
+            raise RateLimitedError(key, bucket.delay(now))
+
+        wait = bucket.reserve(now)
+        stats.requests += 1
+        stats.total_wait_seconds += wait
+        stats.max_wait_seconds = max(stats.max_wait_seconds, wait)
+
+        if wait > 0:
+            stats.queue_depth += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                stats.queue_depth -= 1
+        return wait
+
+    async def acquire_url(self, url: str) -> float:
+        """Wait for a slot on the domain of a URL."""
+        return await self.acquire(domain_key(url))
+
+    def defer(self, key: str, seconds: float) -> None:
+        """Block a key for the given number of seconds."""
+        bucket = self._bucket(key)
+        bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + seconds)
+        self._stats[key].throttled += 1
+        logger.warning(f"Throttling {key} for {seconds:.0f}s")
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get queue depth and wait-time metrics for all keys."""
+        keys = {
+            key: {
+                "queue_depth": stats.queue_depth,
+                "requests": stats.requests,
+                "throttled": stats.throttled,
+                "avg_wait_ms": int(stats.total_wait_seconds / stats.requests * 1000)
+                if stats.requests else 0,
+                "max_wait_ms": int(stats.max_wait_seconds * 1000),
+            }
+            for key, stats in self._stats.items()
+        }
+        return {
+            "total_queue_depth": sum(s.queue_depth for s in self._stats.values()),
+            "total_requests": sum(s.requests for s in self._stats.values()),
+            "total_wait_ms": int(sum(s.total_wait_seconds for s in self._stats.values()) * 1000),
+            "keys": keys,
+        }
+
+
+def domain_key(url: str) -> str:
+    """Get the scheduler key for a URL's host."""
+    try:
+        host = (urlsplit(url).hostname or "").lower()
+    except ValueError:
+        # Malformed URLs fail at fetch time; they share one key until then
+        host = ""
+    if host.startswith("www."):
+        host = host[4:]
+    return f"domain:{host}"
+
+
+def search_key(backend_name: str) -> str:
+    """Get the scheduler key for a search backend."""
+    return f"search:{backend_name}"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+# Global scheduler instance
+_scheduler: Optional[OutboundScheduler] = None
+
+
+def get_scheduler() -> OutboundScheduler:
+    """Get the shared outbound scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = OutboundScheduler(
+            domain_rate=settings.domain_rate_per_second,
+            domain_burst=settings.domain_burst,
+            search_rate=settings.search_rate_per_second,
+            search_burst=settings.search_burst,
+            max_wait_seconds=settings.scheduler_max_wait_seconds,
+        )
+    return _scheduler
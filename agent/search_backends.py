@@ -0,0 +1,416 @@
+"""Search backend abstraction for the web search tools."""
+
+import abc
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from agent.http_client import get_http_client
+from agent.scheduler import get_scheduler, search_key
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class SearchRateLimitedError(Exception):
+    """Raised by a backend when the engine reports rate limiting."""
+
+    def __init__(self, backend: str, retry_after: Optional[float] = None):
+        super().__init__(f"Search backend {backend} is rate limited")
+        self.backend = backend
+        self.retry_after = retry_after
+
+
+class SearchBackend(abc.ABC):
+    """Base class for search engines used by the web search tools.
+
+    Backends return results already normalized to the
+    ``{"title", "url", "snippet"}`` shape used throughout the agent.
+    Native-async engines implement ``search`` directly; blocking engines
+    should subclass ``ThreadedSearchBackend`` instead.
+
+    ``run_search`` applies the backend's rate limit and the global
+    concurrency cap around ``search``. Composite backends that dispatch to
+    other backends set ``composite`` so the limits are applied to each
+    underlying engine instead.
+    """
+
+    name: str
+    composite: bool = False
+
+    @abc.abstractmethod
+    async def search(
+        self,
+        query: str,
+        max_results: int = 10,
+        time_range: Optional[str] = None,
+    ) -> list[dict]:
+        """Run a search and return normalized results."""
+        pass
+
+
+class ThreadedSearchBackend(SearchBackend):
+    """Adapter that runs a synchronous engine on the shared search executor."""
+
+    @abc.abstractmethod
+    def search_sync(
+        self,
+        query: str,
+        max_results: int = 10,
+        time_range: Optional[str] = None,
+    ) -> list[dict]:
+        """Blocking search implementation, executed off the event loop."""
+        pass
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 10,
+        time_range: Optional[str] = None,
+    ) -> list[dict]:
+        """Run the blocking search on the bounded executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_executor(),
+            self.search_sync,
+            query,
+            max_results,
+            time_range,
+        )
+
+
+class DuckDuckGoBackend(ThreadedSearchBackend):
+    """DuckDuckGo search via the synchronous ``duckduckgo_search`` client."""
+
+    name = "duckduckgo"
+
+    def __init__(self):
+        """Initialize the backend, failing if the client is unavailable."""
+        from duckduckgo_search import DDGS
+        from duckduckgo_search.exceptions import RatelimitException
+        self._ddgs_cls = DDGS
+        self._ratelimit_exc = RatelimitException
+
+    def search_sync(
+        self,
+        query: str,
+        max_results: int = 10,
+        time_range: Optional[str] = None,
+    ) -> list[dict]:
+        """Execute a DuckDuckGo text search."""
+        # A client per call keeps the worker threads from sharing session state
+        try:
+            results = self._ddgs_cls().text(
+                query,
+                max_results=max_results,
+                timelimit=time_range,
+            )
+        except self._ratelimit_exc as e:
+            raise SearchRateLimitedError(self.name) from e
+        return [
+            {
+                "title": r.get("title", ""),
+                "url": r.get("href", ""),
+                "snippet": r.get("body", ""),
+            }
+            for r in results or []
+        ]
+
+
+class SearxNGBackend(SearchBackend):
+    """SearxNG metasearch via its JSON API, using the shared HTTP client."""
+
+    name = "searxng"
+
+    TIME_RANGES = {"d": "day", "w": "week", "m": "month", "y": "year"}
+
+    def __init__(self, base_url: str):
+        """Initialize the backend for a SearxNG instance."""
+        if not base_url:
+            raise ValueError("SEARXNG_URL is not set")
+        self.base_url = base_url.rstrip("/")
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 10,
+        time_range: Optional[str] = None,
+    ) -> list[dict]:
+        """Execute a SearxNG search."""
+        params = {"q": query, "format": "json"}
+        if time_range in self.TIME_RANGES:
+            params["time_range"] = self.TIME_RANGES[time_range]
+
+        response = await get_http_client().get(f"{self.base_url}/search", params=params)
+        if response.status_code == 429:
+            raise SearchRateLimitedError(self.name)
+        response.raise_for_status()
+
+        return [
+            {
+                "title": r.get("title", ""),
+                "url": r.get("url", ""),
+                "snippet": r.get("content", ""),
+            }
+            for r in response.json().get("results", [])[:max_results]
+        ]
+
+
+class HedgedSearchBackend(SearchBackend):
+    """
+    Hedged requests across an ordered list of backends.
+
+    The primary backend is queried first. If it has not answered within the
+    hedge delay (a percentile of its recent latencies), the next backend is
+    queried as well, and so on down the list; a backend that fails
+    immediately triggers the next one without waiting. The first non-empty
+    answer wins and the remaining requests are cancelled.
+    """
+
+    composite = True
+
+    MIN_SAMPLES = 20
+
+    def __init__(
+        self,
+        backends: list[SearchBackend],
+        percentile: float = 95.0,
+        initial_delay: float = 3.0,
+        min_delay: float = 0.5,
+        max_samples: int = 200,
+    ):
+        """Initialize the hedged backend."""
+        self.backends = backends
+        self.name = "+".join(b.name for b in backends)
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self._latencies: dict[str, deque[float]] = {
+            b.name: deque(maxlen=max_samples) for b in backends
+        }
+        self.hedges = 0
+        self.wins: Counter[str] = Counter()
+
+    def hedge_delay(self, backend: SearchBackend) -> float:
+        """Seconds to wait on a backend before hedging to the next one."""
+        samples = sorted(self._latencies[backend.name])
+        if len(samples) < self.MIN_SAMPLES:
+            return self.initial_delay
+        index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        return max(self.min_delay, samples[index])
+
+    async def _timed(
+        self,
+        backend: SearchBackend,
+        query: str,
+        max_results: int,
+        time_range: Optional[str],
+    ) -> list[dict]:
+        """Run one backend under its limits, recording its latency.
+
+        A request cancelled because another backend won never finished, so
+        its elapsed time understates its latency. It is recorded as at least
+        the current hedge delay, which keeps slow backends from dragging the
+        percentile down as their answers are cut short.
+        """
+        start = time.monotonic()
+        try:
+            results = await run_search(backend, query, max_results, time_range)
+        except asyncio.CancelledError:
+            elapsed = time.monotonic() - start
+            self._latencies[backend.name].append(max(elapsed, self.hedge_delay(backend)))
+            raise
+        self._latencies[backend.name].append(time.monotonic() - start)
+        return results
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 10,
+        time_range: Optional[str] = None,
+    ) -> list[dict]:
+        """Search with hedging, returning the first non-empty answer."""
+        pending: dict[asyncio.Task, SearchBackend] = {}
+        first_error: Optional[BaseException] = None
+        answered_empty = False
+        remaining = list(self.backends)
+
+        try:
+            while remaining or pending:
+                if remaining:
+                    backend = remaining.pop(0)
+                    if pending:
+                        self.hedges += 1
+                        logger.info(f"Hedging search to {backend.name}: {query}")
+                    task = asyncio.create_task(
+                        self._timed(backend, query, max_results, time_range)
+                    )
+                    pending[task] = backend
+                    # Wait for an answer or, if there is another backend, the hedge delay
+                    timeout = self.hedge_delay(backend) if remaining else None
+                else:
+                    timeout = None
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    winner = pending.pop(task)
+                    if task.exception() is not None:
+                        logger.warning(f"Search backend {winner.name} failed: {task.exception()}")
+                        first_error = first_error or task.exception()
+                    elif task.result():
+                        self.wins[winner.name] += 1
+                        return task.result()
+                    else:
+                        answered_empty = True
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if answered_empty or first_error is None:
+            return []
+        raise first_error
+
+    def stats(self) -> dict[str, Any]:
+        """Get hedging counters and current hedge delays."""
+        return {
+            "backends": [b.name for b in self.backends],
+            "hedges": self.hedges,
+            "wins": dict(self.wins),
+            "hedge_delay_ms": {
+                b.name: int(self.hedge_delay(b) * 1000) for b in self.backends[:-1]
+            },
+        }
+
+
+# Shared executor for all search calls in the process, and a concurrency
+# limit per backend so a hanging engine can't starve the ones hedging for it
+_executor: Optional[ThreadPoolExecutor] = None
+_semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the bounded executor used for blocking search engines."""
+    global _executor
+    if _executor is None:
+        settings = get_settings()
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.search_executor_workers,
+            thread_name_prefix="search",
+        )
+    return _executor
+
+
+def _get_semaphore(backend_name: str) -> asyncio.Semaphore:
+    """Get the concurrency limiter of a search backend."""
+    if backend_name not in _semaphores:
+        _semaphores[backend_name] = asyncio.Semaphore(get_settings().search_max_concurrency)
+    return _semaphores[backend_name]
+
+
+async def run_search(
+    backend: SearchBackend,
+    query: str,
+    max_results: int = 10,
+    time_range: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> list[dict]:
+    """Run a search under the backend's rate limit, its concurrency limit
+    and a timeout.
+
+    Raises:
+        asyncio.TimeoutError: If the backend does not answer in time.
+        SearchRateLimitedError: If the engine throttled the request.
+        RateLimitedError: If the backend is throttled for too long to wait.
+    """
+    settings = get_settings()
+    if timeout is None:
+        timeout = settings.search_timeout_seconds
+
+    if backend.composite:
+        return await asyncio.wait_for(
+            backend.search(query, max_results=max_results, time_range=time_range),
+            timeout=timeout,
+        )
+
+    scheduler = get_scheduler()
+    key = search_key(backend.name)
+    await scheduler.acquire(key)
+
+    async with _get_semaphore(backend.name):
+        try:
+            return await asyncio.wait_for(
+                backend.search(query, max_results=max_results, time_range=time_range),
+                timeout=timeout,
+            )
+        except SearchRateLimitedError as e:
+            scheduler.defer(key, e.retry_after or settings.rate_limit_backoff_seconds)
+            raise
+
+
+def create_search_backend(name: str) -> SearchBackend:
+    """
+    Create a search backend by name.
+
+    Raises:
+        ImportError: If the engine's client library is not installed
+        ValueError: If the name is unknown or the engine is not configured
+    """
+    if name == "duckduckgo":
+        return DuckDuckGoBackend()
+    if name == "searxng":
+        return SearxNGBackend(get_settings().searxng_url)
+    raise ValueError(f"Unknown search backend: {name}")
+
+
+# Shared backend instance, so hedging latency samples span all runs
+_backend: Optional[SearchBackend] = None
+
+
+def get_search_backend() -> Optional[SearchBackend]:
+    """Get the configured search backend, or None if no engine is available.
+
+    Several configured backends are combined into a HedgedSearchBackend in
+    the configured order; backends that cannot be created are skipped.
+    """
+    global _backend
+    if _backend is not None:
+        return _backend
+
+    settings = get_settings()
+    backends = []
+    for name in settings.search_backends_list:
+        try:
+            backends.append(create_search_backend(name))
+        except ImportError:
+            logger.warning(f"Client for search backend {name} not installed, skipping it")
+        except ValueError as e:
+            logger.warning(f"Skipping search backend {name}: {e}")
+
+    if not backends:
+        logger.warning("No search backend available, web search will be limited")
+        return None
+
+    if len(backends) == 1:
+        _backend = backends[0]
+    else:
+        _backend = HedgedSearchBackend(
+            backends,
+            percentile=settings.search_hedge_percentile,
+            initial_delay=settings.search_hedge_initial_delay_seconds,
+            min_delay=settings.search_hedge_min_delay_seconds,
+        )
+    return _backend
+
+
+def shutdown_search_executor() -> None:
+    """Shut down the shared search executor."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    _semaphores.clear()
@@ -0,0 +1,184 @@
+"""Search result cache shared by all tools that query the search engine."""
+
+import asyncio
+import json
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import aiosqlite
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query so trivially different spellings share a cache entry.
+
+    Applies Unicode NFKC folding, lowercases, collapses whitespace and strips
+    trailing punctuation. Word order is preserved since it can change results.
+    """
+    query = unicodedata.normalize("NFKC", query).lower()
+    query = re.sub(r"\s+", " ", query).strip()
+    return query.rstrip("?!.,;: ")
+
+
+def make_cache_key(query: str, max_results: int, time_range: Optional[str]) -> str:
+    """Build the cache key for a search call."""
+    return f"{normalize_query(query)}|{max_results}|{time_range or ''}"
+
+
+class SearchCache:
+    """
+    Two-tier TTL cache for search results.
+
+    The in-memory tier is an LRU bounded by entry count. The optional SQLite
+    tier persists results across restarts and is consulted on memory misses.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        db_path: Optional[Path] = None,
+    ):
+        """Initialize the search cache."""
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.db_path = db_path
+
+        self.hits = 0
+        self.misses = 0
+
+        self._memory: OrderedDict[str, tuple[float, list[dict]]] = OrderedDict()
+        self._connection: Optional[aiosqlite.Connection] = None
+        self._connect_lock = asyncio.Lock()
+
+    async def _conn(self) -> Optional[aiosqlite.Connection]:
+        """Get the SQLite tier connection, opening it on first use."""
+        if self.db_path is None:
+            return None
+        async with self._connect_lock:
+            if self._connection is None:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._connection = await aiosqlite.connect(str(self.db_path))
+                await self._connection.execute("""
+                    CREATE TABLE IF NOT EXISTS search_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        results TEXT NOT NULL,
+                        stored_at REAL NOT NULL
+                    )
+                """)
+                await self._connection.commit()
+        return self._connection
+
+    def _remember(self, key: str, stored_at: float, results: list[dict]) -> None:
+        """Insert into the memory tier, evicting the oldest entries."""
+        self._memory[key] = (stored_at, results)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get(
+        self,
+        query: str,
+        max_results: int,
+        time_range: Optional[str] = None,
+    ) -> Optional[list[dict]]:
+        """Look up unexpired results for a search call."""
+        key = make_cache_key(query, max_results, time_range)
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            stored_at, results = entry
+            if now - stored_at < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return results
+            del self._memory[key]
+
+        conn = await self._conn()
+        if conn is not None:
+            try:
+                cursor = await conn.execute(
+                    "SELECT results, stored_at FROM search_cache WHERE cache_key = ?",
+                    (key,)
+                )
+                row = await cursor.fetchone()
+                if row is not None and now - row[1] < self.ttl_seconds:
+                    results = json.loads(row[0])
+                    self._remember(key, row[1], results)
+                    self.hits += 1
+                    return results
+            except (aiosqlite.Error, ValueError) as e:
+                logger.warning(f"Search cache lookup failed: {e}")
+
+        self.misses += 1
+        return None
+
+    async def put(
+        self,
+        query: str,
+        max_results: int,
+        time_range: Optional[str],
+        results: list[dict],
+    ) -> None:
+        """Store results for a search call."""
+        key = make_cache_key(query, max_results, time_range)
+        stored_at = time.time()
+        self._remember(key, stored_at, results)
+
+        conn = await self._conn()
+        if conn is not None:
+            try:
+                await conn.execute(
+                    "INSERT OR REPLACE INTO search_cache (cache_key, results, stored_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, json.dumps(results), stored_at)
+                )
+                await conn.commit()
+            except aiosqlite.Error as e:
+                logger.warning(f"Search cache write failed: {e}")
+
+    async def close(self) -> None:
+        """Close the SQLite tier connection."""
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+
+# Global search cache instance
+_search_cache: Optional[SearchCache] = None
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Get the shared search cache, or None if caching is disabled."""
+    global _search_cache
+    settings = get_settings()
+    if not settings.search_cache_enabled:
+        return None
+    if _search_cache is None:
+        _search_cache = SearchCache(
+            ttl_seconds=settings.search_cache_ttl_seconds,
+            max_entries=settings.search_cache_max_entries,
+            db_path=(
+                settings.data_dir / "cache" / "search.db"
+                if settings.search_cache_persistent else None
+            ),
+        )
+    return _search_cache
+
+
+async def close_search_cache() -> None:
+    """Close the shared search cache."""
+    global _search_cache
+    if _search_cache is not None:
+        await _search_cache.close()
+        _search_cache = None
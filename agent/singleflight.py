@@ -0,0 +1,71 @@
+"""Single-flight coalescing of identical in-flight async calls."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Call:
+    """An in-flight call and the number of callers awaiting it."""
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key.
+
+    The first caller for a key starts the work as a separate task; callers
+    arriving while it runs await the same task instead of repeating the
+    work. Each caller awaits through ``asyncio.shield``, so cancelling one
+    caller never cancels the shared work for the others. The work is only
+    cancelled once every caller waiting on it has been cancelled.
+    """
+
+    def __init__(self):
+        """Initialize the single-flight group."""
+        self._calls: dict[Hashable, _Call] = {}
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        """Drop a finished or abandoned call so later callers start fresh."""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+    ) -> tuple[Any, bool]:
+        """
+        Run ``fn`` once per key among concurrent callers.
+
+        Returns:
+            The shared result and whether it was produced by another caller
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = _Call(task=asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), shared
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                self._forget(key, call)
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running."""
+        return len(self._calls)
@@ -0,0 +1,201 @@
+"""Local token counting and per-message token accounting."""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Optional
+
+from agent.model_provider import ChatMessage
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Per-message overhead of the chat format, in tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+FALLBACK_ENCODING = "o200k_base"
+# Longest a run waits for an encoding download before approximating instead
+ENCODING_LOAD_TIMEOUT_SECONDS = 10.0
+
+
+class TokenCounter:
+    """
+    Counts tokens with tiktoken, or approximately without it.
+
+    The encoding for the model is used when tiktoken knows it, otherwise a
+    general-purpose encoding. If tiktoken is not installed or the encoding
+    cannot be loaded, counts fall back to a characters/4 estimate, which is
+    close enough for budgeting English text.
+    """
+
+    def __init__(self, model: Optional[str] = None, approximate: bool = False):
+        """Initialize the counter for a model, loading its encoding unless approximating."""
+        self.model = model
+        self._encoding = None if approximate else self._load_encoding(model)
+
+    @staticmethod
+    def _load_encoding(model: Optional[str]):
+        """Load the tiktoken encoding for a model, or None to approximate."""
+        try:
+            import tiktoken
+        except ImportError:
+            logger.info("tiktoken not installed, approximating token counts")
+            return None
+
+        try:
+            try:
+                return tiktoken.encoding_for_model(model or "")
+            except KeyError:
+                return tiktoken.get_encoding(FALLBACK_ENCODING)
+        except Exception as e:
+            # Encodings are downloaded on first use and may be unavailable offline
+            logger.warning(f"Could not load tiktoken encoding, approximating token counts: {e}")
+            return None
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from a real tokenizer."""
+        return self._encoding is not None
+
+    def count_text(self, text: Optional[str]) -> int:
+        """Count the tokens in a piece of text."""
+        if not text:
+            return 0
+        if self._encoding is None:
+            return len(text) // 4 + 1
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def count_message(self, message: ChatMessage) -> int:
+        """Count the tokens a message takes up in the prompt."""
+        tokens = MESSAGE_OVERHEAD_TOKENS + self.count_text(message.content)
+        for tool_call in message.tool_calls or []:
+            function = tool_call["function"]
+            tokens += (
+                MESSAGE_OVERHEAD_TOKENS
+                + self.count_text(function["name"])
+                + self.count_text(function["arguments"])
+            )
+        return tokens
+
+
+class TokenLedger:
+    """
+    Running token totals for a message history.
+
+    Each message is counted once when it is added and the count is cached,
+    so totals never require re-encoding the history. Messages whose content
+    is rewritten later (compaction, spills) must go through
+    ``replace_content`` to keep the totals right.
+    """
+
+    def __init__(self, counter: TokenCounter):
+        """Initialize an empty ledger."""
+        self.counter = counter
+        self.total = 0
+        self.by_role: dict[str, int] = defaultdict(int)
+        self.by_tool: dict[str, int] = defaultdict(int)
+        # Keyed by id(); the history holds every message for the ledger's lifetime
+        self._counts: dict[int, int] = {}
+        self._tool_names: dict[str, str] = {}
+
+    def _tool_name(self, message: ChatMessage) -> Optional[str]:
+        """Get the tool that produced a tool message."""
+        if message.role != "tool":
+            return None
+        return self._tool_names.get(message.tool_call_id or "", "unknown")
+
+    def _apply(self, message: ChatMessage, delta: int) -> None:
+        """Add a token delta to every total the message belongs to."""
+        self.total += delta
+        self.by_role[message.role] += delta
+        tool_name = self._tool_name(message)
+        if tool_name is not None:
+            self.by_tool[tool_name] += delta
+
+    def add(self, message: ChatMessage) -> int:
+        """Count a newly appended message and return its token count."""
+        for tool_call in message.tool_calls or []:
+            self._tool_names[tool_call["id"]] = tool_call["function"]["name"]
+
+        tokens = self.counter.count_message(message)
+        self._counts[id(message)] = tokens
+        self._apply(message, tokens)
+        return tokens
+
+    def count(self, message: ChatMessage) -> int:
+        """Get the cached token count of a message in the history."""
+        tokens = self._counts.get(id(message))
+        if tokens is None:
+            tokens = self.counter.count_message(message)
+        return tokens
+
+    def replace_content(self, message: ChatMessage, content: Optional[str]) -> int:
+        """
+        Rewrite a message's content and update the totals.
+
+        Returns:
+            Tokens saved (negative if the message grew)
+        """
+        before = self.count(message)
+        message.content = content
+        after = self.counter.count_message(message)
+        if id(message) in self._counts:
+            self._counts[id(message)] = after
+            self._apply(message, after - before)
+        return before - after
+
+    def snapshot(self) -> dict:
+        """Get the totals as plain dicts."""
+        return {
+            "total": self.total,
+            "by_role": dict(self.by_role),
+            "by_tool": dict(self.by_tool),
+            "exact": self.counter.exact,
+        }
+
+
+# Token counters by model; loading an encoding is slow
+_counters: dict[Optional[str], TokenCounter] = {}
+
+
+# Encoding loads in progress, shared by everyone waiting for the same model
+_loads: dict[Optional[str], asyncio.Task] = {}
+
+
+def get_token_counter(model: Optional[str] = None) -> TokenCounter:
+    """Get a shared token counter, for the default model if none is given.
+
+    This may download the encoding and block; on the event loop use
+    ``load_token_counter``.
+    """
+    model = model or get_settings().default_model
+    if model not in _counters:
+        _counters[model] = TokenCounter(model)
+    return _counters[model]
+
+
+async def load_token_counter(
+    model: Optional[str] = None,
+    timeout: float = ENCODING_LOAD_TIMEOUT_SECONDS,
+) -> TokenCounter:
+    """
+    Get a shared token counter without blocking the event loop.
+
+    The encoding is loaded in a thread. If that takes longer than
+    ``timeout``, an approximate counter is returned for now, and the load
+    carries on so later callers get the exact one.
+    """
+    model = model or get_settings().default_model
+    if model in _counters:
+        return _counters[model]
+
+    if model not in _loads:
+        _loads[model] = asyncio.create_task(asyncio.to_thread(get_token_counter, model))
+    task = _loads[model]
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+    except TimeoutError:
+        logger.warning(f"Token encoding for {model} still loading, approximating token counts")
+        return TokenCounter(model, approximate=True)
+    finally:
+        if task.done():
+            _loads.pop(model, None)
@@ -1,14 +1,50 @@
 """Tool definitions for the Deep Research agent."""
 
 import abc
+import asyncio
 import json
 import logging
+import time
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Optional, Protocol
 from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+import httpx
+
+from agent.extraction import extract_page_async, shutdown_extraction_pool
+from agent.http_client import close_http_client, get_http_client
+from agent.page_cache import CachedPage, PageCache, get_page_cache
+from agent.prefetch import Prefetcher
+from agent.retry import CircuitOpenError, RetryPolicy, RetryStats, call_with_retry
+from agent.scheduler import (
+    RateLimitedError,
+    domain_key,
+    get_scheduler,
+    parse_retry_after,
+    search_key,
+)
+from agent.search_backends import (
+    SearchBackend,
+    SearchRateLimitedError,
+    get_search_backend,
+    run_search,
+    shutdown_search_executor,
+)
+from agent.search_cache import SearchCache, close_search_cache, get_search_cache, make_cache_key
+from agent.singleflight import SingleFlight
+from agent.urls import canonicalize_url, normalize_url
+from backend.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Process-wide coalescing of identical in-flight fetches and searches
+_browse_flights = SingleFlight()
+_search_flights = SingleFlight()
+
+# OpenAI-format schemas by tool set; tool schemas never change at runtime
+_schema_cache: dict[tuple[str, ...], list[dict]] = {}
+
 
 @dataclass
 class ToolSchema:
@@ -61,14 +97,16 @@ class WebSearchTool(BaseTool):
     name = "web_search"
     description = "Search the web for information on a topic. Returns a list of relevant search results with titles, URLs, and snippets."
     
-    def __init__(self):
+    def __init__(
+        self,
+        backend: Optional[SearchBackend] = None,
+        cache: Optional[SearchCache] = None,
+    ):
         """Initialize the web search tool."""
-        try:
-            from duckduckgo_search import DDGS
-            self.ddgs = DDGS()
-        except ImportError:
-            self.ddgs = None
-            logger.warning("duckduckgo_search not installed, web search will be limited")
+        self.backend = backend or get_search_backend()
+        self.cache = cache or get_search_cache()
+        # Set by the toolset to warm up the pages a search turns up
+        self.prefetcher: Optional[Prefetcher] = None
     
     def get_schema(self) -> ToolSchema:
         """Get the tool schema."""
@@ -105,60 +143,131 @@ class WebSearchTool(BaseTool):
         **kwargs
     ) -> ToolResult:
         """Execute a web search."""
+        retry_stats = RetryStats()
         try:
-            if self.ddgs is None:
+            if self.cache is not None:
+                cached = await self.cache.get(query, max_results, time_range)
+                if cached is not None:
+                    if self.prefetcher is not None:
+                        self.prefetcher.schedule(cached)
+                    return ToolResult(
+                        success=True,
+                        output=cached,
+                        metadata={
+                            "query": query,
+                            "result_count": len(cached),
+                            "cache": "hit",
+                        }
+                    )
+            
+            backend = self.backend
+            if backend is None:
                 return ToolResult(
                     success=False,
                     output=None,
                     error="Web search not available (duckduckgo_search not installed)"
                 )
             
-            results = list(self.ddgs.text(
-                query,
-                max_results=max_results,
-                timelimit=time_range
-            ))
-            
-            formatted_results = [
-                {
-                    "title": r.get("title", ""),
-                    "url": r.get("href", ""),
-                    "snippet": r.get("body", ""),
-                }
-                for r in results
-            ]
+            formatted_results, coalesced = await _search_flights.do(
+                make_cache_key(query, max_results, time_range),
+                lambda: self._search(backend, query, max_results, time_range, retry_stats),
+            )
+            if self.prefetcher is not None:
+                self.prefetcher.schedule(formatted_results)
             
             return ToolResult(
                 success=True,
                 output=formatted_results,
-                metadata={"query": query, "result_count": len(formatted_results)}
+                metadata={
+                    "query": query,
+                    "result_count": len(formatted_results),
+                    "cache": "miss",
+                    "coalesced": coalesced,
+                    "retries": retry_stats.retries,
+                }
             )
             
+        except (SearchRateLimitedError, RateLimitedError, CircuitOpenError) as e:
+            logger.warning(f"Web search unavailable: {e}")
+            return ToolResult(
+                success=False,
+                output=None,
+                error=f"{e}. Try again later or use cached results.",
+                metadata={"query": query, "retries": retry_stats.retries}
+            )
+        except TimeoutError:
+            logger.error(f"Web search timed out: {query}")
+            return ToolResult(
+                success=False,
+                output=None,
+                error="Web search timed out",
+                metadata={"query": query, "retries": retry_stats.retries}
+            )
         except Exception as e:
             logger.error(f"Web search failed: {e}")
             return ToolResult(
                 success=False,
                 output=None,
-                error=str(e)
+                error=str(e),
+                metadata={"query": query, "retries": retry_stats.retries}
             )
 
 
+    async def _search(
+        self,
+        backend: SearchBackend,
+        query: str,
+        max_results: int,
+        time_range: Optional[str],
+        retry_stats: RetryStats,
+    ) -> list[dict]:
+        """Query the backend with retries and populate the cache."""
+        results = await call_with_retry(
+            lambda: run_search(
+                backend,
+                query,
+                max_results=max_results,
+                time_range=time_range,
+            ),
+            search_key(backend.name),
+            retry_stats,
+        )
+        
+        # Empty result lists are often a throttled engine, so don't pin them
+        if self.cache is not None and results:
+            await self.cache.put(query, max_results, time_range, results)
+        
+        return results
+
+
 class WebBrowseTool(BaseTool):
     """Tool for browsing and extracting content from web pages."""
     
     name = "web_browse"
     description = "Browse a web page and extract its text content. Useful for reading full articles, documentation, or any web page content."
     
-    def __init__(self):
-        """Initialize the web browse tool."""
-        import httpx
-        self.client = httpx.AsyncClient(
-            timeout=30.0,
-            follow_redirects=True,
-            headers={
-                "User-Agent": "Mozilla/5.0 (compatible; DeepResearchBot/1.0)"
-            }
-        )
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[PageCache] = None,
+    ):
+        """Initialize the web browse tool.
+        
+        Without an explicit client the tool borrows the process-wide pooled
+        client on every call, so it never owns a connection pool itself.
+        The tool remembers every page it has extracted, keyed by canonical
+        URL, so one instance should be used per run.
+        """
+        self._client = client
+        self.cache = cache or get_page_cache()
+        self.seen: dict[str, dict[str, Any]] = {}
+        # Set by the toolset; holds pages fetched ahead of the browse
+        self.prefetcher: Optional[Prefetcher] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get the HTTP client used for fetching pages."""
+        return self._client or get_http_client()
     
     def get_schema(self) -> ToolSchema:
         """Get the tool schema."""
@@ -189,54 +298,52 @@ class WebBrowseTool(BaseTool):
         **kwargs
     ) -> ToolResult:
         """Browse a web page and extract content."""
+        canonical = canonicalize_url(url)
+        if canonical in self.seen:
+            return self._repeat_result(url, canonical, extract_links)
+        
+        retry_stats = RetryStats()
         try:
-            from bs4 import BeautifulSoup
-            from markdownify import markdownify
-            
-            response = await self.client.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
-            
-            # Get main content
-            main_content = soup.find("main") or soup.find("article") or soup.body
-            
-            if main_content:
-                # Convert to markdown for cleaner output
-                text = markdownify(str(main_content), heading_style="ATX")
+            prefetched = None
+            if self.prefetcher is not None:
+                prefetched = await self.prefetcher.take(url)
+            if prefetched is not None:
+                (page, cache_status, transfer), coalesced = prefetched, False
             else:
-                text = soup.get_text(separator="\n", strip=True)
-            
-            # Truncate if too long
-            max_chars = 15000
-            if len(text) > max_chars:
-                text = text[:max_chars] + "\n\n[Content truncated...]"
+                (page, cache_status, transfer), coalesced = await self.fetch(url, retry_stats)
+            extracted = page.extracted
+            self.seen[canonical] = {"url": url, "extracted": extracted}
             
             result = {
                 "url": url,
-                "title": soup.title.string if soup.title else "",
-                "content": text,
+                "title": extracted["title"],
+                "content": extracted["content"],
             }
             
             if extract_links:
-                links = []
-                for a in soup.find_all("a", href=True):
-                    href = a["href"]
-                    if href.startswith("http"):
-                        links.append({
-                            "text": a.get_text(strip=True),
-                            "url": href
-                        })
-                result["links"] = links[:50]  # Limit links
+                result["links"] = extracted["links"]
+            
+            metadata = {
+                "url": url,
+                "content_length": len(extracted["content"]),
+                "canonical_url": canonical,
+                "cache": cache_status,
+                "coalesced": coalesced,
+                "prefetched": prefetched is not None,
+                "repeat": False,
+                "retries": retry_stats.retries,
+                **transfer,
+            }
+            if coalesced:
+                # The leading caller already accounted for the download
+                metadata["bytes_transferred"] = 0
+            if self.cache is not None:
+                metadata.update(self.cache.stats())
             
             return ToolResult(
                 success=True,
                 output=result,
-                metadata={"url": url, "content_length": len(text)}
+                metadata=metadata
             )
             
         except Exception as e:
@@ -244,8 +351,185 @@ class WebBrowseTool(BaseTool):
             return ToolResult(
                 success=False,
                 output=None,
-                error=str(e)
+                error=str(e),
+                metadata={"url": url, "retries": retry_stats.retries}
             )
+    
+    async def fetch(
+        self,
+        url: str,
+        retry_stats: RetryStats,
+        policy: Optional[RetryPolicy] = None,
+        coalesce: bool = True,
+    ) -> tuple[tuple[CachedPage, str, dict[str, Any]], bool]:
+        """Fetch a page with retries, coalesced with identical in-flight fetches.
+        
+        Fetches with a weaker retry policy than a browse expects should pass
+        ``coalesce=False``; otherwise a browse joining them would inherit
+        their policy.
+        
+        Returns the result of ``_fetch_page`` and whether it was coalesced.
+        """
+        def attempt():
+            return call_with_retry(
+                lambda: self._fetch_page(url), domain_key(url), retry_stats, policy=policy
+            )
+        
+        if not coalesce:
+            return await attempt(), False
+        return await _browse_flights.do(normalize_url(url), attempt)
+    
+    def _repeat_result(self, url: str, canonical: str, extract_links: bool) -> ToolResult:
+        """Answer a repeat browse from the content extracted earlier in the run."""
+        first = self.seen[canonical]
+        extracted = first["extracted"]
+        
+        result = {
+            "url": url,
+            "title": extracted["title"],
+            "content": extracted["content"],
+            "repeat": True,
+        }
+        if extract_links:
+            result["links"] = extracted["links"]
+        
+        return ToolResult(
+            success=True,
+            output=result,
+            metadata={
+                "url": url,
+                "canonical_url": canonical,
+                "first_url": first["url"],
+                "content_length": len(extracted["content"]),
+                "repeat": True,
+                "bytes_transferred": 0,
+            }
+        )
+    
+    async def _fetch_page(self, url: str) -> tuple[CachedPage, str, dict[str, Any]]:
+        """Fetch a page through the cache.
+        
+        Returns the page, how it was served (``hit`` for a fresh cache entry,
+        ``revalidated`` for a stale entry confirmed by a 304, ``stale`` for an
+        expired entry served while the domain is throttled, or ``miss``) and
+        the transfer statistics for the call.
+        """
+        cache = self.cache
+        cached = await cache.get(url) if cache is not None else None
+        transfer = {
+            "bytes_transferred": 0,
+            "bytes_used": 0,
+            "download_truncated": False,
+            "scheduler_wait_ms": 0,
+        }
+        
+        if cache is not None and cached is not None and cached.is_fresh(cache.ttl_seconds):
+            cache.hits += 1
+            return cached, "hit", transfer
+        
+        headers = cached.conditional_headers() if cached is not None else {}
+        settings = get_settings()
+        
+        scheduler = get_scheduler()
+        try:
+            waited = await scheduler.acquire_url(url)
+        except RateLimitedError:
+            # Better a stale copy than nothing while the domain is throttled
+            if cached is None:
+                raise
+            return cached, "stale", transfer
+        transfer["scheduler_wait_ms"] = int(waited * 1000)
+        
+        async with self.client.stream("GET", url, headers=headers) as response:
+            if response.status_code in (429, 503):
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None or response.status_code == 429:
+                    scheduler.defer(
+                        domain_key(url),
+                        retry_after if retry_after is not None else settings.rate_limit_backoff_seconds,
+                    )
+            
+            if cache is not None and cached is not None and response.status_code == 304:
+                cache.revalidations += 1
+                transfer["bytes_transferred"] = response.num_bytes_downloaded
+                cached.fetched_at = time.time()
+                cached.etag = response.headers.get("ETag", cached.etag)
+                cached.last_modified = response.headers.get("Last-Modified", cached.last_modified)
+                await cache.put(cached)
+                return cached, "revalidated", transfer
+            
+            response.raise_for_status()
+            
+            content_type = response.headers.get("Content-Type", "")
+            if content_type and not is_text_content_type(content_type):
+                raise ValueError(f"Unsupported content type: {content_type.split(';')[0]}")
+            
+            body, truncated = await read_capped(response, settings.browse_max_bytes)
+            if not content_type and looks_binary(body[:1024]):
+                raise ValueError("Unsupported content: response body looks binary")
+            
+            transfer["bytes_transferred"] = response.num_bytes_downloaded
+            transfer["bytes_used"] = len(body)
+            transfer["download_truncated"] = truncated
+            text = body.decode(response.encoding or "utf-8", errors="replace")
+        
+        page = CachedPage(
+            url=url,
+            body=text,
+            extracted=await extract_page_async(text),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        
+        if cache is not None:
+            cache.misses += 1
+            if "no-store" not in response.headers.get("Cache-Control", "").lower():
+                await cache.put(page)
+        
+        return page, "miss", transfer
+
+
+TEXT_CONTENT_TYPES = {
+    "application/xhtml+xml",
+    "application/xml",
+    "application/json",
+    "application/ld+json",
+    "application/rss+xml",
+    "application/atom+xml",
+}
+
+
+def is_text_content_type(content_type: str) -> bool:
+    """Check whether a Content-Type header denotes a textual payload."""
+    mime = content_type.split(";")[0].strip().lower()
+    return (
+        mime.startswith("text/")
+        or mime in TEXT_CONTENT_TYPES
+        or mime.endswith("+xml")
+        or mime.endswith("+json")
+    )
+
+
+def looks_binary(sample: bytes) -> bool:
+    """Sniff the start of an unlabelled body for binary content."""
+    return b"\x00" in sample or sample.startswith((b"%PDF", b"\x89PNG", b"PK\x03\x04", b"\xff\xd8\xff"))
+
+
+async def read_capped(response: httpx.Response, max_bytes: int) -> tuple[bytes, bool]:
+    """Read a streamed (decompressed) body, stopping after ``max_bytes``.
+    
+    Returns the body and whether it was cut short.
+    """
+    chunks = []
+    received = 0
+    async for chunk in response.aiter_bytes():
+        remaining = max_bytes - received
+        if len(chunk) >= remaining:
+            chunks.append(chunk[:remaining])
+            return b"".join(chunks), True
+        chunks.append(chunk)
+        received += len(chunk)
+    return b"".join(chunks), False
 
 
 class BatchWebSurferTool(BaseTool):
@@ -256,10 +540,18 @@ class BatchWebSurferTool(BaseTool):
     This is more efficient than separate search and browse calls.
     Use this for comprehensive information gathering on a topic."""
     
-    def __init__(self):
-        """Initialize the batch web surfer tool."""
-        self.search_tool = WebSearchTool()
-        self.browse_tool = WebBrowseTool()
+    def __init__(
+        self,
+        search_tool: Optional[WebSearchTool] = None,
+        browse_tool: Optional[WebBrowseTool] = None,
+    ):
+        """Initialize the batch web surfer tool.
+        
+        Passing the run's own browse tool shares its seen-set, so pages
+        already read in the run are not fetched again.
+        """
+        self.search_tool = search_tool or WebSearchTool()
+        self.browse_tool = browse_tool or WebBrowseTool()
     
     def get_schema(self) -> ToolSchema:
         """Get the tool schema."""
@@ -296,42 +588,104 @@ class BatchWebSurferTool(BaseTool):
         max_results_per_query: int = 5,
         **kwargs
     ) -> ToolResult:
-        """Execute batch web research."""
-        import asyncio
+        """Execute batch web research.
         
-        all_results = []
+        Searches and browses are fanned out concurrently under a per-call
+        and per-host limit. If the overall deadline passes, whatever has
+        completed so far is returned.
+        """
+        settings = get_settings()
+        call_limit = asyncio.Semaphore(settings.batch_max_concurrency)
+        host_limits: dict[str, asyncio.Semaphore] = {}
+        # Pages claimed by a query in this call, so overlapping queries browse
+        # them once; each claim resolves to whether its browse succeeded
+        claims: dict[str, asyncio.Future[bool]] = {}
+        duplicates = 0
+        
+        # Results are filled in place so partial progress survives the deadline
+        query_results: list[dict[str, Any]] = [
+            {"query": query, "search_results": None, "browsed_content": {}}
+            for query in queries[:5]  # Limit to 5 queries
+        ]
         
-        for query in queries[:5]:  # Limit to 5 queries
-            # Search
-            search_result = await self.search_tool.execute(
-                query=query,
-                max_results=max_results_per_query
+        async def fetch(url: str) -> ToolResult:
+            try:
+                host = urlparse(url).netloc.lower()
+            except ValueError:
+                host = ""
+            host_limit = host_limits.setdefault(
+                host, asyncio.Semaphore(settings.batch_per_host_concurrency)
             )
+            async with call_limit, host_limit:
+                return await self.browse_tool.execute(url=url)
+        
+        async def browse(query_result: dict, index: int, url: str) -> None:
+            nonlocal duplicates
+            canonical = canonicalize_url(url)
+            # Wait out another query's claim; if its browse fails, take it over
+            while canonical in claims:
+                if await asyncio.shield(claims[canonical]):
+                    duplicates += 1
+                    return
+            claim = claims[canonical] = asyncio.get_running_loop().create_future()
+            succeeded = False
+            try:
+                browse_result = await fetch(url)
+                succeeded = browse_result.success
+            finally:
+                if not succeeded:
+                    del claims[canonical]
+                claim.set_result(succeeded)
+            if succeeded:
+                query_result["browsed_content"][index] = {
+                    "url": url,
+                    "title": browse_result.output.get("title", ""),
+                    "content": browse_result.output.get("content", "")[:5000],
+                    "repeat": browse_result.metadata.get("repeat", False),
+                }
+        
+        async def process_query(query_result: dict) -> None:
+            async with call_limit:
+                search_result = await self.search_tool.execute(
+                    query=query_result["query"],
+                    max_results=max_results_per_query
+                )
             
             if not search_result.success:
-                continue
+                return
             
-            query_result = {
-                "query": query,
-                "search_results": search_result.output,
-                "browsed_content": []
-            }
+            query_result["search_results"] = search_result.output
             
-            # Browse top N results
-            urls_to_browse = [
-                r["url"] for r in search_result.output[:browse_top_n]
-            ]
-            
-            for url in urls_to_browse:
-                browse_result = await self.browse_tool.execute(url=url)
-                if browse_result.success:
-                    query_result["browsed_content"].append({
-                        "url": url,
-                        "title": browse_result.output.get("title", ""),
-                        "content": browse_result.output.get("content", "")[:5000]
-                    })
-            
-            all_results.append(query_result)
+            # Browse top N results, skipping pages another query already browsed
+            await asyncio.gather(*(
+                browse(query_result, i, r["url"])
+                for i, r in enumerate(search_result.output[:browse_top_n])
+            ))
+        
+        tasks = [asyncio.create_task(process_query(qr)) for qr in query_results]
+        done, pending = await asyncio.wait(tasks, timeout=settings.batch_deadline_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning(
+                f"Batch web surfer hit its {settings.batch_deadline_seconds}s deadline, "
+                f"returning partial results"
+            )
+        for task in done:
+            if task.exception() is not None:
+                logger.error(f"Batch web surfer query failed: {task.exception()}")
+        
+        all_results = []
+        for query_result in query_results:
+            if query_result["search_results"] is None:
+                continue
+            browsed = query_result["browsed_content"]
+            all_results.append({
+                "query": query_result["query"],
+                "search_results": query_result["search_results"],
+                "browsed_content": [browsed[i] for i in sorted(browsed)],
+            })
         
         return ToolResult(
             success=True,
@@ -340,7 +694,9 @@ class BatchWebSurferTool(BaseTool):
                 "queries_processed": len(queries),
                 "total_pages_browsed": sum(
                     len(r["browsed_content"]) for r in all_results
-                )
+                ),
+                "duplicate_urls_skipped": duplicates,
+                "deadline_exceeded": bool(pending),
             }
         )
 
@@ -674,6 +1030,89 @@ class FileReadTool(BaseTool):
             )
 
 
+class ContextReadTool(BaseTool):
+    """Tool for paging spilled tool outputs back into context."""
+    
+    name = "context_read"
+    description = "Read a tool output that was moved out of the conversation to save space. Use the name given in the placeholder; long outputs can be read in pages."
+    
+    def __init__(self, workdir: str):
+        """Initialize the context read tool."""
+        self.workdir = workdir
+    
+    def get_schema(self) -> ToolSchema:
+        """Get the tool schema."""
+        return ToolSchema(
+            name=self.name,
+            description=self.description,
+            parameters={
+                "type": "object",
+                "properties": {
+                    "name": {
+                        "type": "string",
+                        "description": "Name of the spilled output, as shown in the placeholder"
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Character offset to start reading from (default: 0)",
+                        "default": 0
+                    },
+                    "max_chars": {
+                        "type": "integer",
+                        "description": "Maximum characters to return (default: 6000)",
+                        "default": 6000
+                    }
+                },
+                "required": ["name"]
+            }
+        )
+    
+    async def execute(
+        self,
+        name: str,
+        offset: int = 0,
+        max_chars: int = 6000,
+        **kwargs
+    ) -> ToolResult:
+        """Read a page of spilled content."""
+        try:
+            import os
+
+            import aiofiles
+            
+            filepath = os.path.join(self.workdir, "context", os.path.basename(name))
+            if not os.path.exists(filepath):
+                return ToolResult(
+                    success=False,
+                    output=None,
+                    error=f"No spilled output named {name}"
+                )
+            
+            async with aiofiles.open(filepath, encoding="utf-8") as f:
+                content = await f.read()
+            
+            offset = max(0, offset)
+            end = min(len(content), offset + max(1, max_chars))
+            return ToolResult(
+                success=True,
+                output={
+                    "name": name,
+                    "content": content[offset:end],
+                    "offset": offset,
+                    "total_chars": len(content),
+                    "next_offset": end if end < len(content) else None,
+                }
+            )
+            
+        except Exception as e:
+            logger.error(f"Context read failed: {e}")
+            return ToolResult(
+                success=False,
+                output=None,
+                error=str(e)
+            )
+
+
 class FileEditTool(BaseTool):
     """Tool for patch-based file editing."""
     
@@ -932,6 +1371,18 @@ class CrossValidateTool(BaseTool):
             )
 
 
+class ToolRunner(Protocol):
+    """What the agent needs from a toolset: the schemas and a way to run them."""
+    
+    def get_all_schemas(self) -> list[dict]:
+        """Get all tool schemas in OpenAI format."""
+        ...
+    
+    async def execute(self, tool_name: str, **kwargs) -> ToolResult:
+        """Execute a tool by name."""
+        ...
+
+
 class ToolSet:
     """Collection of tools available to the agent."""
     
@@ -941,11 +1392,27 @@ class ToolSet:
         self.workdir = workdir
         self.ablations = ablations or {}
         
-        # Core tools (always available)
+        # Core tools (always available); the web tools share per-run state
+        web_search = WebSearchTool()
+        web_browse = WebBrowseTool()
+        
+        settings = get_settings()
+        self.prefetcher: Optional[Prefetcher] = None
+        if settings.prefetch_enabled:
+            self.prefetcher = Prefetcher(
+                web_browse,
+                top_k=settings.prefetch_top_k,
+                max_bytes=settings.prefetch_max_bytes_per_run,
+                max_concurrency=settings.prefetch_max_concurrency,
+                rank_by_authority=self.ablations.get("enable_authority_ranking", True),
+            )
+            web_search.prefetcher = self.prefetcher
+            web_browse.prefetcher = self.prefetcher
+
         self.tools: dict[str, BaseTool] = {
-            "web_search": WebSearchTool(),
-            "web_browse": WebBrowseTool(),
-            "batch_web_surfer": BatchWebSurferTool(),
+            "web_search": web_search,
+            "web_browse": web_browse,
+            "batch_web_surfer": BatchWebSurferTool(web_search, web_browse),
             "file_write": FileWriteTool(workdir),
             "file_read": FileReadTool(workdir),
         }
@@ -957,6 +1424,9 @@ class ToolSet:
         if self.ablations.get("enable_patch_editing", True):
             self.tools["file_edit"] = FileEditTool(workdir)
         
+        if settings.enable_disk_context:
+            self.tools["context_read"] = ContextReadTool(workdir)
+        
         if self.ablations.get("enable_reflection", True):
             self.tools["reflect"] = ReflectTool()
             self.tools["cross_validate"] = CrossValidateTool()
@@ -966,8 +1436,14 @@ class ToolSet:
         return self.tools.get(name)
     
     def get_all_schemas(self) -> list[dict]:
-        """Get all tool schemas in OpenAI format."""
-        return [tool.get_schema().to_openai_format() for tool in self.tools.values()]
+        """Get all tool schemas in OpenAI format (shared; do not modify)."""
+        # The ablations and settings decide which tools exist, so the names are the key
+        key = tuple(self.tools)
+        schemas = _schema_cache.get(key)
+        if schemas is None:
+            schemas = [tool.get_schema().to_openai_format() for tool in self.tools.values()]
+            _schema_cache[key] = schemas
+        return schemas
     
     def list_tools(self) -> list[str]:
         """List available tool names."""
@@ -990,3 +1466,34 @@ class ToolSet:
         if isinstance(todo_tool, TodoTool):
             return todo_tool.get_state()
         return None
+    
+    def restore_todo_state(self, items: list[dict]) -> None:
+        """Restore the todo list, e.g. from a checkpoint."""
+        todo_tool = self.tools.get("todo")
+        if isinstance(todo_tool, TodoTool):
+            todo_tool.items = {item["id"]: dict(item) for item in items}
+    
+    def get_prefetch_stats(self) -> Optional[dict]:
+        """Get speculative prefetch counters if prefetching is enabled."""
+        if self.prefetcher is None:
+            return None
+        return self.prefetcher.stats()
+    
+    async def close(self) -> None:
+        """Stop background work started by the tools."""
+        if self.prefetcher is not None:
+            await self.prefetcher.close()
+
+
+async def close_shared_resources() -> None:
+    """
+    Release the process-wide resources the tools open on first use.
+
+    The search executor, extraction pool, search cache and HTTP client
+    outlive any one ToolSet. The search cache runs a non-daemon thread, so
+    a process that used the tools hangs at exit until this is called.
+    """
+    shutdown_search_executor()
+    shutdown_extraction_pool()
+    await close_search_cache()
+    await close_http_client()
@@ -0,0 +1,97 @@
+"""URL helpers shared by the browsing tools and caches."""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for use as a cache key.
+
+    Lowercases the scheme and host, drops default ports and the fragment,
+    and gives empty paths a single slash. The result still points at the
+    same resource as the input. A URL too malformed to parse, such as one
+    with an out-of-range port, is returned stripped but otherwise as is,
+    so fetching it fails where the error can be reported.
+
+    Args:
+        url: The URL to normalize
+
+    Returns:
+        Normalized URL string
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    netloc = host
+    if port is not None and DEFAULT_PORTS.get(scheme) != port:
+        netloc = f"{host}:{port}"
+    if parts.username:
+        userinfo = parts.username
+        if parts.password:
+            userinfo += f":{parts.password}"
+        netloc = f"{userinfo}@{netloc}"
+
+    path = parts.path or "/"
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid",
+    "mc_cid", "mc_eid", "igshid", "ref_src", "_hsenc", "_hsmi",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+
+def is_tracking_param(name: str) -> bool:
+    """Check whether a query parameter is a known tracking parameter."""
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonicalize a URL for deduplicating pages within a run.
+
+    On top of ``normalize_url`` this treats ``http`` and ``https``, a
+    leading ``www.`` and a trailing slash as the same page, and drops
+    tracking parameters while sorting the rest. The result identifies an
+    article but is not guaranteed to be fetchable; keep the original URL
+    for requests. Malformed URLs come back stripped, as from
+    ``normalize_url``.
+
+    Args:
+        url: The URL to canonicalize
+
+    Returns:
+        Canonical URL string
+    """
+    normalized = normalize_url(url)
+    try:
+        parts = urlsplit(normalized)
+    except ValueError:
+        return normalized
+    scheme = "https" if parts.scheme in ("http", "https") else parts.scheme
+
+    netloc = parts.netloc
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+
+    path = parts.path
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+
+    params = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not is_tracking_param(name)
+    ]
+    query = urlencode(sorted(params))
+    return urlunsplit((scheme, netloc, path, query, ""))
@@ -43,6 +43,174 @@ class Settings(BaseSettings):
     max_agent_steps: int = Field(default=50, description="Maximum agent steps")
     max_context_tokens: int = Field(default=128000, description="Maximum context tokens")
     enable_disk_context: bool = Field(default=True, description="Enable disk-backed context")
+    resume_interrupted_runs: bool = Field(
+        default=True,
+        description="On startup, resume runs a previous process left unfinished (otherwise fail them)"
+    )
+    resume_max_concurrency: int = Field(
+        default=2,
+        ge=1,
+        description="Maximum interrupted runs resumed at once on startup"
+    )
+    budget_wrap_up_fraction: float = Field(
+        default=0.85,
+        description="Share of a run budget after which the agent stops researching and writes the report"
+    )
+    
+    # HTTP Client Configuration
+    http2_enabled: bool = Field(default=True, description="Enable HTTP/2 for outbound fetches")
+    http_timeout_seconds: float = Field(default=30.0, description="Outbound HTTP timeout")
+    http_max_connections: int = Field(default=100, description="Maximum pooled connections")
+    http_max_keepalive_connections: int = Field(
+        default=20,
+        description="Maximum idle keep-alive connections"
+    )
+    http_keepalive_expiry_seconds: float = Field(
+        default=30.0,
+        description="Idle time before a keep-alive connection is closed"
+    )
+    
+    browse_max_bytes: int = Field(
+        default=2 * 1024 * 1024,
+        description="Maximum decoded bytes read from a single page"
+    )
+    
+    # Outbound Rate Limiting Configuration
+    domain_rate_per_second: float = Field(
+        default=2.0,
+        description="Sustained request rate per domain across all runs"
+    )
+    domain_burst: int = Field(default=4, description="Burst size per domain")
+    search_rate_per_second: float = Field(
+        default=1.0,
+        description="Sustained request rate per search backend across all runs"
+    )
+    search_burst: int = Field(default=3, description="Burst size per search backend")
+    rate_limit_backoff_seconds: float = Field(
+        default=30.0,
+        description="Backoff after a 429 or rate-limit error without Retry-After"
+    )
+    scheduler_max_wait_seconds: float = Field(
+        default=60.0,
+        description="Fail instead of queueing when a slot is further away than this"
+    )
+    
+    # Retry and Circuit Breaker Configuration
+    retry_max_attempts: int = Field(
+        default=3,
+        description="Attempts per idempotent fetch or search, including the first"
+    )
+    retry_base_delay_seconds: float = Field(
+        default=0.5,
+        description="Base delay for jittered exponential backoff"
+    )
+    retry_max_delay_seconds: float = Field(default=8.0, description="Maximum backoff delay")
+    circuit_failure_threshold: int = Field(
+        default=5,
+        description="Consecutive host failures before its circuit opens"
+    )
+    circuit_cooldown_seconds: float = Field(
+        default=60.0,
+        description="Time an open circuit fails fast before probing again"
+    )
+    
+    # Page Cache Configuration
+    page_cache_enabled: bool = Field(default=True, description="Enable the web page cache")
+    page_cache_ttl_seconds: float = Field(
+        default=6 * 3600,
+        description="Age after which cached pages are revalidated"
+    )
+    page_cache_max_bytes: int = Field(
+        default=512 * 1024 * 1024,
+        description="Disk size cap for the page cache"
+    )
+    
+    # Speculative Prefetch Configuration
+    prefetch_enabled: bool = Field(
+        default=True,
+        description="Fetch top search results in the background before they are browsed"
+    )
+    prefetch_top_k: int = Field(default=2, description="Results prefetched per search")
+    prefetch_max_bytes_per_run: int = Field(
+        default=8 * 1024 * 1024,
+        description="Bytes a run may download speculatively"
+    )
+    prefetch_max_concurrency: int = Field(
+        default=2,
+        description="Prefetches in flight at once per run"
+    )
+    
+    # Artifact Store Configuration
+    blob_inline_max_bytes: int = Field(
+        default=4096,
+        description="Tool results larger than this are stored as blobs and referenced"
+    )
+    
+    # Page Extraction Configuration
+    extraction_engine: Literal["auto", "selectolax", "bs4"] = Field(
+        default="auto",
+        description="HTML extraction engine (auto prefers selectolax when installed)"
+    )
+    extraction_workers: int = Field(
+        default=2,
+        description="Extraction worker processes (0 extracts in a thread instead)"
+    )
+    
+    # Web Search Configuration
+    search_backends: str = Field(
+        default="duckduckgo",
+        description="Comma-separated search backends in hedging order (duckduckgo, searxng)"
+    )
+    searxng_url: str = Field(default="", description="Base URL of a SearxNG instance")
+    search_hedge_percentile: float = Field(
+        default=95.0,
+        description="Primary latency percentile after which the next backend is tried"
+    )
+    search_hedge_initial_delay_seconds: float = Field(
+        default=3.0,
+        description="Hedge delay used until enough latency samples are collected"
+    )
+    search_hedge_min_delay_seconds: float = Field(
+        default=0.5,
+        description="Lower bound for the hedge delay"
+    )
+    search_timeout_seconds: float = Field(default=20.0, description="Timeout per search call")
+    search_max_concurrency: int = Field(
+        default=4,
+        description="Maximum concurrent calls to each search backend across all runs"
+    )
+    search_executor_workers: int = Field(
+        default=8,
+        description="Worker threads for blocking search engines"
+    )
+    
+    search_cache_enabled: bool = Field(default=True, description="Enable the search result cache")
+    search_cache_ttl_seconds: float = Field(
+        default=3600.0,
+        description="Lifetime of cached search results"
+    )
+    search_cache_max_entries: int = Field(
+        default=2000,
+        description="Maximum entries in the in-memory search cache"
+    )
+    search_cache_persistent: bool = Field(
+        default=True,
+        description="Also keep search results in a SQLite cache under data_dir"
+    )
+    
+    # Batch Web Surfer Configuration
+    batch_max_concurrency: int = Field(
+        default=8,
+        description="Maximum concurrent searches and fetches per batch call"
+    )
+    batch_per_host_concurrency: int = Field(
+        default=2,
+        description="Maximum concurrent fetches to one host per batch call"
+    )
+    batch_deadline_seconds: float = Field(
+        default=45.0,
+        description="Deadline for a batch call before partial results are returned"
+    )
     
     # Security Configuration
     shell_sandbox_mode: bool = Field(default=True, description="Enable shell sandbox")
@@ -67,6 +235,11 @@ class Settings(BaseSettings):
     enable_todo_state: bool = Field(default=True, description="Enable todo state tracking")
     enable_patch_editing: bool = Field(default=True, description="Enable patch-based editing")
     
+    @property
+    def search_backends_list(self) -> list[str]:
+        """Get the ordered list of search backend names."""
+        return [name.strip() for name in self.search_backends.split(",") if name.strip()]
+    
     @property
     def allowed_commands_list(self) -> list[str]:
         """Get list of allowed shell commands."""
@@ -79,6 +252,8 @@ class Settings(BaseSettings):
         (self.data_dir / "traces").mkdir(exist_ok=True)
         (self.data_dir / "artifacts").mkdir(exist_ok=True)
         (self.data_dir / "evidence").mkdir(exist_ok=True)
+        (self.data_dir / "cache").mkdir(exist_ok=True)
+        (self.data_dir / "cassettes").mkdir(exist_ok=True)
 
 
 @lru_cache
@@ -82,7 +82,9 @@ class Database:
                 metrics TEXT NOT NULL DEFAULT '{}',
                 error_message TEXT,
                 report_artifact_path TEXT,
-                trace_path TEXT
+                trace_path TEXT,
+                parent_run_id TEXT,
+                forked_from_step INTEGER
             );
             
             -- Tool events table
@@ -113,6 +115,8 @@ class Database:
                 tool_event_id TEXT,
                 cross_validated INTEGER NOT NULL DEFAULT 0,
                 validation_sources TEXT NOT NULL DEFAULT '[]',
+                content_ref TEXT,
+                hit_count INTEGER NOT NULL DEFAULT 1,
                 FOREIGN KEY (run_id) REFERENCES runs(run_id),
                 FOREIGN KEY (tool_event_id) REFERENCES tool_events(event_id)
             );
@@ -172,8 +176,24 @@ class Database:
             CREATE INDEX IF NOT EXISTS idx_evidence_run_id ON evidence(run_id);
             CREATE INDEX IF NOT EXISTS idx_claims_run_id ON claims(run_id);
         """)
+        await self._migrate()
         await self.conn.commit()
     
+    async def _migrate(self) -> None:
+        """Add columns introduced after a database was first created."""
+        await self._ensure_column("evidence", "content_ref", "TEXT")
+        await self._ensure_column("evidence", "hit_count", "INTEGER NOT NULL DEFAULT 1")
+        await self._ensure_column("runs", "parent_run_id", "TEXT")
+        await self._ensure_column("runs", "forked_from_step", "INTEGER")
+    
+    async def _ensure_column(self, table: str, column: str, definition: str) -> None:
+        """Add a column to a table if it is missing."""
+        cursor = await self.conn.execute(f"PRAGMA table_info({table})")
+        columns = {row["name"] for row in await cursor.fetchall()}
+        if column not in columns:
+            logger.info(f"Adding column {table}.{column}")
+            await self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    
     # ========================================
     # Run Operations
     # ========================================
@@ -185,8 +205,8 @@ class Database:
             INSERT INTO runs (
                 run_id, query, config, status, current_phase, created_at,
                 started_at, completed_at, metrics, error_message,
-                report_artifact_path, trace_path
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                report_artifact_path, trace_path, parent_run_id, forked_from_step
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 run.run_id,
@@ -201,6 +221,8 @@ class Database:
                 run.error_message,
                 run.report_artifact_path,
                 run.trace_path,
+                run.parent_run_id,
+                run.forked_from_step,
             )
         )
         await self.conn.commit()
@@ -250,6 +272,7 @@ class Database:
                 completed_at=run.completed_at,
                 citation_count=run.metrics.citation_count,
                 tool_calls=run.metrics.total_tool_calls,
+                parent_run_id=run.parent_run_id,
             ))
         
         return summaries
@@ -302,6 +325,8 @@ class Database:
             error_message=row["error_message"],
             report_artifact_path=row["report_artifact_path"],
             trace_path=row["trace_path"],
+            parent_run_id=row["parent_run_id"],
+            forked_from_step=row["forked_from_step"],
         )
     
     # ========================================
@@ -394,8 +419,8 @@ class Database:
             INSERT INTO evidence (
                 evidence_id, run_id, source_url, source_title, snippet,
                 authority_tier, retrieved_at, tool_event_id, cross_validated,
-                validation_sources
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                validation_sources, content_ref, hit_count
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 evidence.evidence_id,
@@ -408,6 +433,8 @@ class Database:
                 evidence.tool_event_id,
                 1 if evidence.cross_validated else 0,
                 json.dumps(evidence.validation_sources),
+                evidence.content_ref,
+                evidence.hit_count,
             )
         )
         await self.conn.commit()
@@ -435,6 +462,8 @@ class Database:
             tool_event_id=row["tool_event_id"],
             cross_validated=bool(row["cross_validated"]),
             validation_sources=json.loads(row["validation_sources"]),
+            content_ref=row.get("content_ref"),
+            hit_count=row.get("hit_count") or 1,
         )
     
     # ========================================
@@ -72,6 +72,13 @@ class EngineType(str, Enum):
     BASELINE = "baseline"
 
 
+class CassetteMode(str, Enum):
+    """Record/replay mode for model and tool calls."""
+    OFF = "off"
+    RECORD = "record"
+    REPLAY = "replay"
+
+
 # ========================================
 # Configuration Models
 # ========================================
@@ -99,6 +106,30 @@ class RunConfig(BaseModel):
     geography: Optional[str] = Field(default=None, description="Geographic constraint")
     required_sources: Optional[list[str]] = Field(default=None, description="Required source domains")
     ablations: AblationConfig = Field(default_factory=AblationConfig, description="Ablation config")
+    compact_history: bool = Field(default=False, description="Replace aged tool outputs with digests")
+    keep_tool_outputs: int = Field(
+        default=6, ge=0,
+        description="Most recent tool outputs kept verbatim when compacting history"
+    )
+    deadline_seconds: Optional[float] = Field(
+        default=None, gt=0,
+        description="Wall-clock budget for the run in seconds"
+    )
+    max_total_tokens: Optional[int] = Field(default=None, gt=0, description="Token budget for the run")
+    max_cost_usd: Optional[float] = Field(default=None, gt=0, description="Estimated cost budget in USD")
+    stream_responses: bool = Field(
+        default=True,
+        description="Stream model responses, starting tool calls before the turn finishes"
+    )
+    cassette_mode: CassetteMode = Field(default=CassetteMode.OFF, description="Record or replay model/tool calls")
+    cassette_name: Optional[str] = Field(
+        default=None,
+        description="Cassette under data_dir/cassettes (defaults to the run ID when recording)"
+    )
+    cassette_latency_scale: float = Field(
+        default=0.0, ge=0,
+        description="Replay calls after their recorded latency times this factor (0 = instant)"
+    )
 
 
 # ========================================
@@ -111,6 +142,15 @@ class CreateRunRequest(BaseModel):
     config: RunConfig = Field(default_factory=RunConfig, description="Run configuration")
 
 
+class ForkRunRequest(BaseModel):
+    """Request to fork a run from one of its steps."""
+    from_step: int = Field(..., ge=1, description="Last step of the parent run to reuse")
+    config_overrides: dict[str, Any] = Field(
+        default_factory=dict,
+        description="RunConfig fields to change for the fork (ablations are merged key by key)"
+    )
+
+
 class CreateTaskSetRequest(BaseModel):
     """Request to create a task set for evaluation."""
     name: str = Field(..., description="Task set name")
@@ -172,6 +212,8 @@ class Evidence(BaseModel):
     tool_event_id: Optional[str] = Field(default=None, description="Related tool event")
     cross_validated: bool = Field(default=False, description="Whether cross-validated")
     validation_sources: list[str] = Field(default_factory=list, description="Validation source IDs")
+    content_ref: Optional[str] = Field(default=None, description="Blob reference to the full source content")
+    hit_count: int = Field(default=1, ge=1, description="Times the source came up during the run")
 
 
 class Claim(BaseModel):
@@ -257,10 +299,28 @@ class RunMetrics(BaseModel):
     )
     unsupported_claims: int = Field(default=0, description="Claims without citations")
     context_spill_to_disk_events: int = Field(default=0, description="Disk context spills")
+    history_tokens_saved: int = Field(default=0, description="Prompt tokens saved by history compaction")
+    context_tokens: int = Field(default=0, description="Current size of the message history in tokens")
+    context_tokens_by_tool: dict[str, int] = Field(
+        default_factory=dict,
+        description="Message history tokens taken up by each tool's outputs"
+    )
     patch_edit_savings_percent: Optional[float] = Field(
         default=None,
         description="Token savings from patch editing"
     )
+    avg_time_to_first_action_ms: Optional[int] = Field(
+        default=None,
+        description="Mean time from a model call to its first tool dispatch"
+    )
+    budget: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Budget consumption (elapsed time, tokens, cost and the most used share)"
+    )
+    prefetch: dict[str, int] = Field(
+        default_factory=dict,
+        description="Speculative prefetch counters (scheduled, hits, joined, wasted, ...)"
+    )
 
 
 class Run(BaseModel):
@@ -277,6 +337,8 @@ class Run(BaseModel):
     error_message: Optional[str] = Field(default=None, description="Error message if failed")
     report_artifact_path: Optional[str] = Field(default=None, description="Path to report file")
     trace_path: Optional[str] = Field(default=None, description="Path to trace file")
+    parent_run_id: Optional[str] = Field(default=None, description="Run this run was forked from")
+    forked_from_step: Optional[int] = Field(default=None, description="Last parent step reused by a fork")
 
 
 class RunSummary(BaseModel):
@@ -290,6 +352,7 @@ class RunSummary(BaseModel):
     completed_at: Optional[datetime] = None
     citation_count: int = 0
     tool_calls: int = 0
+    parent_run_id: Optional[str] = None
 
 
 # ========================================
@@ -358,10 +421,14 @@ class WSEventType(str, Enum):
     
     # Metrics events
     METRICS_UPDATED = "metrics_updated"
+    BUDGET_UPDATED = "budget_updated"
     
     # Context events
     CONTEXT_SPILL = "context_spill"
     
+    # Streaming events
+    ASSISTANT_DELTA = "assistant_delta"
+    
     # Reflection events
     REFLECTION_STARTED = "reflection_started"
     CROSS_VALIDATION = "cross_validation"
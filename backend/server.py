@@ -1,27 +1,43 @@
 """FastAPI application and routes for Deep Research Showcase."""
 
 import asyncio
+import json
 import logging
+import shutil
 import uuid
 from contextlib import asynccontextmanager
 from datetime import datetime
+from pathlib import Path
 from typing import Any, Optional
 
 from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
-
+from pydantic import ValidationError
+
+from agent.blobstore import get_blob_store, is_blob_ref
+from agent.cassette import cassette_path
+from agent.checkpoint import CHECKPOINT_FILE, fork_checkpoint, read_checkpoint
+from agent.context import CONTEXT_DIR
+from agent.http_client import get_http_client
+from agent.retry import get_circuit_breaker
+from agent.scheduler import get_scheduler
+from agent.search_backends import HedgedSearchBackend, get_search_backend
+from agent.tokens import load_token_counter
+from agent.tools import close_shared_resources
 from backend.config import get_settings
 from backend.database import close_database, get_database
 from backend.models import (
     AgentPhase,
+    CassetteMode,
     ClaimDiff,
     CreateRunRequest,
     CreateTaskSetRequest,
     EngineType,
     EvaluationSummary,
     EvaluationTask,
+    ForkRunRequest,
     OutputFormat,
     PairwiseJudgmentRequest,
     PairwiseResult,
@@ -54,11 +70,21 @@ async def lifespan(app: FastAPI):
     
     # Initialize database
     db = await get_database()
+    
+    # Open the shared outbound HTTP connection pool
+    get_http_client()
+    
+    # Load the default tokenizer before any run waits on it
+    await load_token_counter()
+    
+    # Pick up runs a previous server process left unfinished
+    await recover_interrupted_runs()
     logger.info("Deep Research Showcase API started")
     
     yield
     
     # Shutdown
+    await close_shared_resources()
     await close_database()
     logger.info("Deep Research Showcase API stopped")
 
@@ -99,6 +125,16 @@ async def create_run(request: CreateRunRequest):
     """Create a new research run."""
     db = await get_database()
     
+    config = request.config
+    if config.cassette_mode != CassetteMode.OFF and config.cassette_name is not None:
+        try:
+            path = cassette_path(config.cassette_name)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+    if config.cassette_mode == CassetteMode.REPLAY:
+        if config.cassette_name is None or not path.exists():
+            raise HTTPException(status_code=400, detail="Replay requires an existing cassette_name")
+    
     run = Run(
         run_id=str(uuid.uuid4()),
         query=request.query,
@@ -226,6 +262,113 @@ async def delete_run(run_id: str):
     return {"status": "cancelled", "run_id": run_id}
 
 
+@app.post("/api/runs/{run_id}/fork", response_model=Run)
+async def fork_run(run_id: str, request: ForkRunRequest):
+    """
+    Fork a run from one of its steps with a different config.
+    
+    The fork starts from the parent's checkpoint at ``from_step``: its
+    messages, tool results and evidence up to that step are reused as
+    recorded, and only the steps after it call the model and tools again.
+    """
+    db = await get_database()
+    parent = await db.get_run(run_id)
+    if parent is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    
+    # Forks run live; a cassette can't start partway through
+    if request.config_overrides.get("cassette_mode", CassetteMode.OFF.value) != CassetteMode.OFF.value:
+        raise HTTPException(status_code=400, detail="Forked runs can't record or replay a cassette")
+    overrides = dict(request.config_overrides)
+    ablations = overrides.pop("ablations", None) or {}
+    if not isinstance(ablations, dict):
+        raise HTTPException(status_code=400, detail="config_overrides.ablations must be an object")
+    merged = parent.config.model_dump()
+    merged["ablations"].update(ablations)
+    merged.update(overrides)
+    merged["cassette_mode"] = CassetteMode.OFF
+    merged["cassette_name"] = None
+    try:
+        config = RunConfig(**merged)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid config overrides: {e}") from e
+    if request.from_step >= config.max_steps:
+        raise HTTPException(status_code=400, detail="from_step must be below the fork's max_steps")
+    
+    settings = get_settings()
+    parent_dir = Path(settings.data_dir) / "runs" / run_id
+    entries = read_checkpoint(parent_dir / CHECKPOINT_FILE, request.from_step)
+    if not entries or entries[-1]["step"] != request.from_step:
+        raise HTTPException(status_code=400, detail=f"Run has no checkpoint of step {request.from_step}")
+    
+    fork = Run(
+        run_id=str(uuid.uuid4()),
+        query=parent.query,
+        config=config,
+        status=RunStatus.PENDING,
+        current_phase=AgentPhase(entries[-1]["phase"]),
+        created_at=datetime.utcnow(),
+        metrics=RunMetrics(),
+        parent_run_id=run_id,
+        forked_from_step=request.from_step,
+    )
+    fork_dir = Path(settings.data_dir) / "runs" / fork.run_id
+    
+    # Copy the tool events of the reused steps so the fork's history is complete
+    prefix_events = {
+        tc["event_id"] for entry in entries for tc in entry["tool_calls"] if tc.get("event_id")
+    }
+    event_ids = {}
+    for event in await db.get_tool_events(run_id):
+        if event.event_id in prefix_events:
+            event_ids[event.event_id] = str(uuid.uuid4())
+            await db.create_tool_event(
+                event.model_copy(update={"event_id": event_ids[event.event_id], "run_id": fork.run_id})
+            )
+    
+    await asyncio.to_thread(
+        fork_checkpoint,
+        parent_dir / CHECKPOINT_FILE,
+        fork_dir / CHECKPOINT_FILE,
+        request.from_step,
+        event_ids,
+    )
+    # Spilled outputs stay readable through context_read
+    if (parent_dir / CONTEXT_DIR).is_dir():
+        await asyncio.to_thread(
+            shutil.copytree, parent_dir / CONTEXT_DIR, fork_dir / CONTEXT_DIR, dirs_exist_ok=True
+        )
+    
+    await db.create_run(fork)
+    
+    # Continue from the copied checkpoint in the background
+    asyncio.create_task(execute_research_run(fork.run_id, resume=True))
+    
+    return fork
+
+
+# ========================================
+# Artifact Endpoints
+# ========================================
+
+@app.get("/api/blobs/{ref}")
+async def get_blob(ref: str):
+    """Get a stored tool result or page content by blob reference."""
+    store = get_blob_store()
+    if not is_blob_ref(ref):
+        raise HTTPException(status_code=400, detail="Invalid blob reference")
+    
+    try:
+        data = await store.get(ref)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Blob not found") from None
+    
+    try:
+        return JSONResponse(content=json.loads(data))
+    except ValueError:
+        return PlainTextResponse(data.decode("utf-8", errors="replace"))
+
+
 # ========================================
 # Comparison Endpoints
 # ========================================
@@ -467,6 +610,23 @@ async def get_evaluation_summary():
     )
 
 
+# ========================================
+# Metrics Endpoints
+# ========================================
+
+@app.get("/api/metrics/outbound")
+async def get_outbound_metrics():
+    """Get outbound scheduler queue/wait metrics, circuit breaker and hedging state."""
+    metrics = {
+        **get_scheduler().snapshot(),
+        "circuits": get_circuit_breaker().snapshot(),
+    }
+    backend = get_search_backend()
+    if isinstance(backend, HedgedSearchBackend):
+        metrics["search_hedging"] = backend.stats()
+    return metrics
+
+
 # ========================================
 # Settings Endpoints
 # ========================================
@@ -647,8 +807,60 @@ async def websocket_global_endpoint(websocket: WebSocket):
 # Agent Execution (Background Task)
 # ========================================
 
-async def execute_research_run(run_id: str) -> None:
-    """Execute a research run in the background."""
+# Resumed runs, referenced until they finish so they aren't garbage-collected
+_resume_tasks: set[asyncio.Task] = set()
+
+
+async def resume_run(run_id: str, resume: bool, limit: asyncio.Semaphore) -> None:
+    """Execute an interrupted run once a resume slot is free."""
+    async with limit:
+        await execute_research_run(run_id, resume=resume)
+
+
+async def recover_interrupted_runs() -> None:
+    """
+    Resume or fail runs left pending or running by a previous server process.
+    
+    Running runs and forks continue from their last checkpoint (or start
+    over if they never finished a step). At most ``resume_max_concurrency``
+    run at once, so a crashed evaluation batch doesn't restart all at once.
+    Cassette runs can't be resumed, since recording would restart the
+    cassette and replay would start from its first call, so they are
+    failed, as is everything when resuming is disabled.
+    """
+    settings = get_settings()
+    db = await get_database()
+    limit = asyncio.Semaphore(settings.resume_max_concurrency)
+    
+    orphaned = []
+    for status in (RunStatus.RUNNING, RunStatus.PENDING):
+        orphaned.extend(await db.list_runs(status=status, limit=10000))
+    
+    for summary in orphaned:
+        run = await db.get_run(summary.run_id)
+        if run is None:
+            continue
+        
+        if settings.resume_interrupted_runs and run.config.cassette_mode == CassetteMode.OFF:
+            logger.info(f"Resuming interrupted run {run.run_id}")
+            task = asyncio.create_task(resume_run(
+                run.run_id,
+                resume=run.status == RunStatus.RUNNING or run.forked_from_step is not None,
+                limit=limit,
+            ))
+            _resume_tasks.add(task)
+            task.add_done_callback(_resume_tasks.discard)
+            continue
+        
+        logger.info(f"Failing interrupted run {run.run_id}")
+        run.status = RunStatus.FAILED
+        run.error_message = "Interrupted by a server restart"
+        run.completed_at = datetime.utcnow()
+        await db.update_run(run)
+
+
+async def execute_research_run(run_id: str, resume: bool = False) -> None:
+    """Execute a research run in the background, resuming it from its checkpoint if asked."""
     # Import here to avoid circular imports
     from agent.runner import AgentRunner
     
@@ -664,13 +876,13 @@ async def execute_research_run(run_id: str) -> None:
     try:
         # Update status to running
         run.status = RunStatus.RUNNING
-        run.started_at = datetime.utcnow()
+        run.started_at = run.started_at if resume and run.started_at else datetime.utcnow()
         await db.update_run(run)
         await emitter.run_started()
         
         # Create and run the agent
         runner = AgentRunner(run, db, emitter)
-        await runner.execute()
+        await runner.execute(resume=resume)
         
         # Update status to completed
         run = await db.get_run(run_id)  # Refresh from DB
@@ -283,6 +283,10 @@ class RunEventEmitter:
         """Emit metrics updated event."""
         await self.emit(WSEventType.METRICS_UPDATED, metrics)
     
+    async def budget_updated(self, budget: dict[str, Any]) -> None:
+        """Emit budget consumption event."""
+        await self.emit(WSEventType.BUDGET_UPDATED, budget)
+    
     async def context_spill(self, file_path: str, summary: str) -> None:
         """Emit context spill to disk event."""
         await self.emit(WSEventType.CONTEXT_SPILL, {
@@ -290,6 +294,13 @@ class RunEventEmitter:
             "summary": summary
         })
     
+    async def assistant_delta(self, step: int, delta: str) -> None:
+        """Emit a piece of streamed assistant text."""
+        await self.emit(WSEventType.ASSISTANT_DELTA, {
+            "step": step,
+            "delta": delta
+        })
+    
     async def reflection_started(self, question: str) -> None:
         """Emit reflection started event."""
         await self.emit(WSEventType.REFLECTION_STARTED, {
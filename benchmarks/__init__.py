@@ -0,0 +1 @@
+"""Performance benchmarks for Deep Research Showcase."""
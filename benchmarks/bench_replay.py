@@ -0,0 +1,152 @@
+"""Replay recorded demo scenarios offline to measure agent-loop overhead.
+
+Usage:
+    python -m benchmarks.bench_replay --record [scenario_id ...]
+    python -m benchmarks.bench_replay [scenario_id ...] [--repeat 3] [--latency-scale 0]
+
+Recording runs each scenario from ``backend/scenarios.py`` live (model API,
+search engine and websites) and saves a cassette per scenario. Replaying
+serves every model and web tool call from those cassettes with no network,
+so differences in wall time between commits come from the agent itself.
+History compaction is on unless ``--no-compact-history`` is given, matching
+runs configured with ``compact_history``.
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from agent.cassette import Cassette, CassetteProvider, CassetteToolSet
+from agent.context import ContextManager
+from agent.model_provider import get_provider
+from agent.react_agent import AgentState, ReActAgent
+from agent.tools import ToolSet, close_shared_resources
+from backend.config import get_settings
+from backend.scenarios import get_scenario_by_id, get_scenarios
+
+
+async def run_scenario(
+    scenario: dict,
+    cassette: Cassette,
+    max_steps: int,
+    keep_tool_outputs: Optional[int] = None,
+) -> tuple[float, AgentState]:
+    """Run one scenario through a cassette, returning wall time and final state.
+
+    With ``keep_tool_outputs`` set, history is compacted as in a run with
+    ``compact_history`` on.
+    """
+    provider = None if cassette.mode == "replay" else get_provider()
+    with tempfile.TemporaryDirectory(prefix="bench-replay-") as workdir:
+        toolset = ToolSet(context_id=f"bench-{scenario['id']}", workdir=workdir)
+        context_manager = None
+        if keep_tool_outputs is not None:
+            settings = get_settings()
+            context_manager = ContextManager(
+                workdir=workdir,
+                max_tokens=settings.max_context_tokens,
+                keep_tool_outputs=keep_tool_outputs,
+                spill_to_disk=settings.enable_disk_context,
+            )
+        agent = ReActAgent(
+            provider=CassetteProvider(provider, cassette),
+            toolset=CassetteToolSet(toolset, cassette),
+            max_steps=max_steps,
+            context_manager=context_manager,
+        )
+        state = AgentState(run_id=f"bench-{scenario['id']}")
+        start = time.perf_counter()
+        await agent.run(scenario["query"], state)
+        return time.perf_counter() - start, state
+
+
+async def bench(args: argparse.Namespace) -> int:
+    """Record or replay the selected scenarios, then release the tools' shared resources."""
+    try:
+        return await bench_scenarios(args)
+    finally:
+        await close_shared_resources()
+
+
+async def bench_scenarios(args: argparse.Namespace) -> int:
+    """Record or replay the selected scenarios."""
+    args.cassettes.mkdir(parents=True, exist_ok=True)
+    scenarios = [get_scenario_by_id(s) for s in args.scenarios] if args.scenarios else get_scenarios()
+    if None in scenarios:
+        print("Unknown scenario id", file=sys.stderr)
+        return 1
+
+    keep_tool_outputs = args.keep_tool_outputs if args.compact_history else None
+
+    if not args.record:
+        print(f"{'scenario':<26} {'steps':>5} {'tools':>5} {'best s':>8} {'mean s':>8}")
+
+    for scenario in scenarios:
+        path = args.cassettes / f"{scenario['id']}.jsonl"
+
+        if args.record:
+            elapsed, state = await run_scenario(
+                scenario, Cassette(path, mode="record"), args.max_steps, keep_tool_outputs
+            )
+            print(f"Recorded {scenario['id']}: {state.step_count} steps in {elapsed:.1f}s -> {path}")
+            continue
+
+        if not path.exists():
+            print(f"{scenario['id']:<26} no cassette, record it with --record")
+            continue
+
+        timings = []
+        for _ in range(args.repeat):
+            cassette = Cassette(path, mode="replay", latency_scale=args.latency_scale)
+            elapsed, state = await run_scenario(
+                scenario, cassette, args.max_steps, keep_tool_outputs
+            )
+            timings.append(elapsed)
+        print(
+            f"{scenario['id']:<26} {state.step_count:>5} {len(state.tool_calls):>5} "
+            f"{min(timings):>8.3f} {sum(timings) / len(timings):>8.3f}"
+        )
+
+    return 0
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", help="Scenario ids (default: all)")
+    parser.add_argument("--record", action="store_true", help="Record cassettes from live runs")
+    parser.add_argument(
+        "--cassettes",
+        type=Path,
+        default=get_settings().data_dir / "cassettes" / "scenarios",
+        help="Cassette directory",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Replays per scenario")
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=0.0,
+        help="Replay recorded latencies times this factor (0 = instant)",
+    )
+    parser.add_argument("--max-steps", type=int, default=50, help="Agent step limit")
+    parser.add_argument(
+        "--compact-history",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Replace aged tool outputs with digests",
+    )
+    parser.add_argument(
+        "--keep-tool-outputs",
+        type=int,
+        default=6,
+        help="Most recent tool outputs kept verbatim when compacting history",
+    )
+    return asyncio.run(bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Measure per-step request assembly overhead as a run's history grows.
+
+Usage:
+    python -m benchmarks.bench_request [--steps 200] [--output-chars 4000] [--repeat 20]
+
+Builds a synthetic history of ``--steps`` agent steps (one tool call and one
+tool output each) and times what the agent does before every model call:
+collecting the tool schemas and converting the history to API dicts. The
+"first" columns are the cost of building everything from scratch, which is
+what every step paid before schemas and message dicts were cached; the
+"cached" columns are what a step pays now. The JSON column is the cost of
+encoding the whole request body, which the API client pays on every call
+regardless.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+
+from agent.model_provider import ChatMessage
+from agent.react_agent import DEEP_RESEARCH_SYSTEM_PROMPT
+from agent.tools import ToolSet
+
+
+def build_history(steps: int, output_chars: int) -> list[ChatMessage]:
+    """Build a history shaped like a research run."""
+    messages = [
+        ChatMessage(role="system", content=DEEP_RESEARCH_SYSTEM_PROMPT),
+        ChatMessage(role="user", content="What are the main drivers of grid-scale battery costs?"),
+    ]
+    for step in range(steps):
+        call_id = f"call_{step}"
+        messages.append(ChatMessage(
+            role="assistant",
+            content=f"Step {step}: looking for more sources.",
+            tool_calls=[{
+                "id": call_id,
+                "type": "function",
+                "function": {"name": "web_search", "arguments": json.dumps({"query": f"query {step}"})},
+            }],
+        ))
+        messages.append(ChatMessage(role="tool", tool_call_id=call_id, content="x" * output_chars))
+    return messages
+
+
+def best_of(repeat: int, fn) -> float:
+    """Run ``fn`` ``repeat`` times and return the fastest time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def copy_history(messages: list[ChatMessage]) -> list[ChatMessage]:
+    """Copy a history into new messages with nothing cached."""
+    return [
+        ChatMessage(role=m.role, content=m.content, tool_calls=m.tool_calls,
+                    tool_call_id=m.tool_call_id, name=m.name)
+        for m in messages
+    ]
+
+
+def to_dicts(messages: list[ChatMessage]) -> list[dict]:
+    """Convert a history to API dicts, as the agent does before each model call."""
+    return [m.to_dict() for m in messages]
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=200, help="Steps in the largest history")
+    parser.add_argument("--output-chars", type=int, default=4000, help="Size of each tool output")
+    parser.add_argument("--repeat", type=int, default=20, help="Timings per measurement (best is kept)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-request-") as workdir:
+        toolset = ToolSet(context_id="bench-request", workdir=workdir)
+        tools = list(toolset.tools.values())
+        toolset.get_all_schemas()
+
+        print(
+            f"{'step':>5} {'schemas first ms':>17} {'schemas cached ms':>18} "
+            f"{'msgs first ms':>14} {'msgs cached ms':>15} {'json ms':>8}"
+        )
+        checkpoints = sorted({s for s in (10, 50, 100, args.steps) if s <= args.steps})
+        for steps in checkpoints:
+            history = build_history(steps, args.output_chars)
+            fresh = [copy_history(history) for _ in range(args.repeat)]
+            for m in history:
+                m.to_dict()
+
+            schemas_first = best_of(args.repeat, lambda: [t.get_schema().to_openai_format() for t in tools])
+            schemas_cached = best_of(args.repeat, toolset.get_all_schemas)
+            msgs_first = best_of(args.repeat, lambda fresh=fresh: to_dicts(fresh.pop()))
+            msgs_cached = best_of(args.repeat, lambda history=history: to_dicts(history))
+            body = {"messages": to_dicts(history), "tools": toolset.get_all_schemas()}
+            encode = best_of(args.repeat, lambda body=body: json.dumps(body))
+
+            print(
+                f"{steps:>5} {schemas_first:>17.3f} {schemas_cached:>18.4f} "
+                f"{msgs_first:>14.3f} {msgs_cached:>15.3f} {encode:>8.3f}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
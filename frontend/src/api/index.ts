@@ -11,6 +11,7 @@ import {
   EvaluationSummary,
   EvaluationTask,
   CreateRunRequest,
+  ForkRunRequest,
   DemoScenario,
 } from '../types'
 
@@ -41,6 +42,13 @@ export async function createRun(request: CreateRunRequest): Promise<Run> {
   })
 }
 
+export async function forkRun(runId: string, request: ForkRunRequest): Promise<Run> {
+  return fetchJSON<Run>(`/runs/${runId}/fork`, {
+    method: 'POST',
+    body: JSON.stringify(request),
+  })
+}
+
 export async function listRuns(params?: {
   status?: string
   limit?: number
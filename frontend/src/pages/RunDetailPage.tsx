@@ -21,7 +21,16 @@ export default function RunDetailPage() {
   const { runId } = useParams<{ runId: string }>()
   const [activeTab, setActiveTab] = useState<TabId>('report')
   
-  const { setCurrentRun, handleWSEvent, currentEvidence, currentClaims, currentToolEvents } = useRunStore()
+  const {
+    setCurrentRun,
+    handleWSEvent,
+    currentEvidence,
+    currentClaims,
+    currentToolEvents,
+    liveReasoning,
+    liveReasoningStep,
+    currentRun,
+  } = useRunStore()
 
   const { data: run, isLoading } = useQuery({
     queryKey: ['run', runId],
@@ -63,6 +72,9 @@ export default function RunDetailPage() {
     )
   }
 
+  // Budget updates stream in between polls
+  const budget = currentRun?.run_id === run.run_id ? currentRun.metrics.budget : run.metrics.budget
+
   return (
     <div className="flex-1 flex flex-col overflow-hidden">
       {/* Header */}
@@ -84,6 +96,12 @@ export default function RunDetailPage() {
               </span>
               <span>{run.config.engine}</span>
               {run.current_phase && <span>Phase: {run.current_phase}</span>}
+              {budget?.limiting && (
+                <span className={clsx(budget.fraction_used >= 0.85 && 'text-amber-400')}>
+                  Budget: {Math.round(budget.fraction_used * 100)}% of {budget.limiting}
+                  {budget.wrap_up_reason && ' (wrapping up)'}
+                </span>
+              )}
             </div>
           </div>
           {reportData && (
@@ -125,7 +143,15 @@ export default function RunDetailPage() {
             {reportData?.markdown ? (
               <pre className="whitespace-pre-wrap text-gray-300 text-sm">{reportData.markdown}</pre>
             ) : run.status === 'running' ? (
-              <p className="text-gray-400">Report will appear here when research completes...</p>
+              <div className="space-y-4">
+                <p className="text-gray-400">Report will appear here when research completes...</p>
+                {liveReasoning && (
+                  <div className="p-4 bg-slate-800 rounded-lg border border-slate-700">
+                    <p className="text-xs text-gray-500 mb-2">Step {liveReasoningStep} reasoning</p>
+                    <pre className="whitespace-pre-wrap text-gray-300 text-sm">{liveReasoning}</pre>
+                  </div>
+                )}
+              </div>
             ) : (
               <p className="text-gray-400">No report available</p>
             )}
@@ -174,6 +200,7 @@ export default function RunDetailPage() {
                     {ev.authority_tier}
                   </span>
                   {ev.cross_validated && <span className="text-xs text-green-400">✓ Cross-validated</span>}
+                  {(ev.hit_count ?? 1) > 1 && <span className="text-xs text-gray-500">Seen {ev.hit_count}×</span>}
                 </div>
               </div>
             ))}
@@ -9,6 +9,7 @@ import {
   WSEvent,
   AgentPhase,
   RunMetrics,
+  RunBudget,
 } from '../types'
 
 interface RunState {
@@ -20,6 +21,10 @@ interface RunState {
   currentTodoState: TodoState | null
   currentReportMarkdown: string
   
+  // Assistant text streamed during the current step
+  liveReasoning: string
+  liveReasoningStep: number
+  
   // Run list
   runs: RunSummary[]
   
@@ -47,6 +52,8 @@ interface RunState {
   
   setReportMarkdown: (markdown: string) => void
   
+  appendReasoning: (step: number, delta: string) => void
+  
   setRuns: (runs: RunSummary[]) => void
   
   setCompareRuns: (runA: RunSummary | null, runB: RunSummary | null) => void
@@ -65,6 +72,8 @@ const initialState = {
   currentToolEvents: [],
   currentTodoState: null,
   currentReportMarkdown: '',
+  liveReasoning: '',
+  liveReasoningStep: 0,
   runs: [],
   compareRunA: null,
   compareRunB: null,
@@ -124,6 +133,12 @@ export const useRunStore = create<RunState>((set, get) => ({
   
   setReportMarkdown: (markdown) => set({ currentReportMarkdown: markdown }),
   
+  appendReasoning: (step, delta) => set((state) => ({
+    // Each step's text replaces the previous step's
+    liveReasoning: step === state.liveReasoningStep ? state.liveReasoning + delta : delta,
+    liveReasoningStep: step,
+  })),
+  
   setRuns: (runs) => set({ runs }),
   
   setCompareRuns: (runA, runB) => set({ 
@@ -218,6 +233,14 @@ export const useRunStore = create<RunState>((set, get) => ({
       case 'metrics_updated':
         get().updateRunMetrics(data as Partial<RunMetrics>)
         break
+        
+      case 'budget_updated':
+        get().updateRunMetrics({ budget: data as unknown as RunBudget })
+        break
+        
+      case 'assistant_delta':
+        get().appendReasoning(data.step as number, data.delta as string)
+        break
     }
   },
   
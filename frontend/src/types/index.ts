@@ -27,6 +27,8 @@ export type OutputFormat = 'report' | 'adr' | 'brief' | 'memo'
 
 export type EngineType = 'deep_research' | 'baseline'
 
+export type CassetteMode = 'off' | 'record' | 'replay'
+
 export interface AblationConfig {
   enable_reflection: boolean
   enable_authority_ranking: boolean
@@ -45,6 +47,15 @@ export interface RunConfig {
   geography?: string
   required_sources?: string[]
   ablations: AblationConfig
+  compact_history?: boolean
+  keep_tool_outputs?: number
+  deadline_seconds?: number
+  max_total_tokens?: number
+  max_cost_usd?: number
+  stream_responses?: boolean
+  cassette_mode?: CassetteMode
+  cassette_name?: string
+  cassette_latency_scale?: number
 }
 
 export interface CreateRunRequest {
@@ -52,6 +63,11 @@ export interface CreateRunRequest {
   config: RunConfig
 }
 
+export interface ForkRunRequest {
+  from_step: number
+  config_overrides?: Partial<RunConfig>
+}
+
 export interface RunMetrics {
   total_tool_calls: number
   tool_calls_by_type: Record<string, number>
@@ -66,7 +82,25 @@ export interface RunMetrics {
   citation_authority_mix: Record<string, number>
   unsupported_claims: number
   context_spill_to_disk_events: number
+  history_tokens_saved?: number
+  context_tokens?: number
+  context_tokens_by_tool?: Record<string, number>
   patch_edit_savings_percent?: number
+  avg_time_to_first_action_ms?: number
+  budget?: RunBudget
+  prefetch?: Record<string, number>
+}
+
+export interface RunBudget {
+  elapsed_seconds: number
+  deadline_seconds?: number
+  tokens_used: number
+  max_tokens?: number
+  cost_usd: number
+  max_cost_usd?: number
+  limiting?: string
+  fraction_used: number
+  wrap_up_reason?: string
 }
 
 export interface Run {
@@ -82,6 +116,8 @@ export interface Run {
   error_message?: string
   report_artifact_path?: string
   trace_path?: string
+  parent_run_id?: string
+  forked_from_step?: number
 }
 
 export interface RunSummary {
@@ -94,6 +130,7 @@ export interface RunSummary {
   completed_at?: string
   citation_count: number
   tool_calls: number
+  parent_run_id?: string
 }
 
 export interface ToolEvent {
@@ -121,6 +158,8 @@ export interface Evidence {
   tool_event_id?: string
   cross_validated: boolean
   validation_sources: string[]
+  content_ref?: string
+  hit_count?: number
 }
 
 export interface Claim {
@@ -244,7 +283,9 @@ export type WSEventType =
   | 'report_section_added'
   | 'report_finalized'
   | 'metrics_updated'
+  | 'budget_updated'
   | 'context_spill'
+  | 'assistant_delta'
   | 'reflection_started'
   | 'cross_validation'
 